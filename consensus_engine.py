@@ -5,45 +5,69 @@ Core voting logic for multi-agent decision-making.
 Agents provide (decision, confidence) pairs; votes are weighted by confidence.
 """
 
-from dataclasses import dataclass
-from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple, Union
 from abc import ABC, abstractmethod
+from functools import lru_cache
 import json
 
+import numpy as np
 
-class Decision(Enum):
-    """Binary decision options"""
+# Optional imports (graceful degradation)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+class Decision(IntEnum):
+    """Binary decision options (ABSTAIN == 0 zeroes any weight it multiplies)"""
     YES = 1
     NO = -1
     ABSTAIN = 0
 
 
-@dataclass
+# Decision name -> value, for column-oriented parsing
+_DEC_CODE = {"YES": 1, "NO": -1, "ABSTAIN": 0}
+
+# Decision names indexed by value + 1 (NO, ABSTAIN, YES); avoids a per-vote
+# Enum .name descriptor lookup on serialization paths
+_DEC_NAMES = ("NO", "ABSTAIN", "YES")
+
+
+@dataclass(slots=True)
 class Vote:
     """Single agent vote"""
     agent_id: str
     decision: Decision
     confidence: float  # 0.0 to 1.0
     reasoning: str = ""
+    # Cached at construction so scoring loops skip Enum attribute lookups.
+    # Votes are treated as immutable once created.
+    _value: int = field(init=False, repr=False, compare=False, default=0)
+    _w: float = field(init=False, repr=False, compare=False, default=0.0)
+
+    def __post_init__(self) -> None:
+        self._value = self.decision.value
+        self._w = self._value * self.confidence
 
     def weight(self) -> float:
         """Convert vote to weighted value"""
-        if self.decision == Decision.ABSTAIN:
-            return 0.0
-        return self.decision.value * self.confidence
+        return self._w
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize vote"""
         return {
             "agent_id": self.agent_id,
-            "decision": self.decision.name,
+            "decision": _DEC_NAMES[self._value + 1],
             "confidence": self.confidence,
             "reasoning": self.reasoning,
         }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConsensusResult:
     """Result of consensus voting"""
     final_decision: Decision
@@ -64,6 +88,96 @@ class ConsensusResult:
             "reasoning": self.reasoning,
         }
 
+    def to_json(self) -> str:
+        """Serialize result straight to JSON (votes encoded inline)"""
+        payload = {
+            "final_decision": self.final_decision.name,
+            "weighted_score": round(self.weighted_score, 3),
+            "confidence_level": round(self.confidence_level, 3),
+            "vote_breakdown": self.vote_breakdown,
+            "individual_votes": self.individual_votes,
+            "reasoning": self.reasoning,
+        }
+        if HAS_ORJSON:
+            return orjson.dumps(
+                payload,
+                default=_vote_default,
+                option=orjson.OPT_PASSTHROUGH_DATACLASS,
+            ).decode()
+        return json.dumps(
+            payload,
+            default=_vote_default,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class PairwiseResult:
+    """Result of pairwise consensus over N candidate outputs"""
+    best_index: int
+    scores: List[float]  # Mean utility of each candidate against the others
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize result"""
+        return {
+            "best_index": self.best_index,
+            "scores": [round(score, 3) for score in self.scores],
+        }
+
+
+def _vote_default(obj: Any) -> Dict[str, Any]:
+    """JSON encoder hook for Vote objects"""
+    if isinstance(obj, Vote):
+        return {
+            "agent_id": obj.agent_id,
+            "decision": _DEC_NAMES[obj._value + 1],
+            "confidence": obj.confidence,
+            "reasoning": obj.reasoning,
+        }
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Juries at least this large use the Numba kernel when numba is installed
+NUMBA_MIN_VOTES = 1024
+
+# None = not yet resolved, False = numba unavailable
+_numba_aggregate = None
+
+
+def _aggregate_loop(dec, conf):
+    """Plain-loop reduction over (decisions, confidences); compiled by Numba"""
+    yw = 0.0
+    nw = 0.0
+    yc = 0
+    nc = 0
+    ac = 0
+    for i in range(dec.shape[0]):
+        d = dec[i]
+        c = conf[i]
+        if d == 1:
+            yw += c
+            yc += 1
+        elif d == -1:
+            nw += c
+            nc += 1
+        else:
+            ac += 1
+    return yw - nw, yw, nw, yc, nc, ac
+
+
+def _get_numba_aggregate():
+    """Lazily JIT-compile _aggregate_loop; returns None if numba is missing"""
+    global _numba_aggregate
+    if _numba_aggregate is None:
+        try:
+            from numba import njit
+        except ImportError:
+            _numba_aggregate = False
+        else:
+            _numba_aggregate = njit(cache=True)(_aggregate_loop)
+    return _numba_aggregate or None
+
 
 class ConsensusEngine:
     """Confidence-weighted voting engine for agent consensus"""
@@ -92,24 +206,65 @@ class ConsensusEngine:
         if not votes:
             raise ValueError("No votes to process")
 
-        # Apply calibration to all confidences
-        calibrated_votes = self._calibrate_votes(votes)
+        # Extract decisions and calibrated confidences once
+        dec_arr, conf_arr = self._vectorize(votes)
+        return self._build_result(dec_arr, conf_arr, votes)
 
-        # Compute weighted sum
-        weighted_sum = sum(v.weight() for v in calibrated_votes)
+    def collect_arrays(
+        self, decisions: np.ndarray, confidences: np.ndarray
+    ) -> ConsensusResult:
+        """
+        Aggregate column-oriented votes without building Vote objects.
+
+        Args:
+            decisions: Decision values (1 / -1 / 0), e.g. from votes_from_json_bulk
+            confidences: Matching confidences, 0.0 to 1.0
+
+        Returns:
+            ConsensusResult (individual_votes is left empty)
+        """
+        dec_arr = np.asarray(decisions, dtype=np.int8)
+        conf_arr = np.asarray(confidences, dtype=np.float64)
+        if dec_arr.size == 0:
+            raise ValueError("No votes to process")
+        if dec_arr.shape != conf_arr.shape:
+            raise ValueError("decisions and confidences must have the same length")
+
+        if self.confidence_calibration != 1.0:
+            conf_arr = np.minimum(conf_arr * self.confidence_calibration, 1.0)
+        return self._build_result(dec_arr, conf_arr, [])
+
+    def _build_result(
+        self, dec_arr: np.ndarray, conf_arr: np.ndarray, votes: List[Vote]
+    ) -> ConsensusResult:
+        """Compute the consensus result from decision/confidence arrays"""
+        # Single fused reduction over both arrays
+        (
+            weighted_sum,
+            yes_weight,
+            no_weight,
+            yes_count,
+            no_count,
+            abstain_count,
+        ) = self._aggregate(dec_arr, conf_arr)
 
         # Determine final decision
         final_decision = self._decide_from_score(weighted_sum)
 
         # Calculate confidence (unanimity metric)
-        confidence_level = self._calculate_confidence(calibrated_votes)
+        confidence_level = self._calculate_confidence(yes_weight, no_weight)
 
         # Build breakdown
-        vote_breakdown = self._count_votes(votes)
+        vote_breakdown = {"YES": yes_count, "NO": no_count, "ABSTAIN": abstain_count}
 
         # Generate reasoning
         reasoning = self._generate_reasoning(
-            calibrated_votes, weighted_sum, final_decision, confidence_level
+            weighted_sum,
+            final_decision,
+            confidence_level,
+            yes_weight,
+            no_weight,
+            vote_breakdown,
         )
 
         return ConsensusResult(
@@ -121,21 +276,79 @@ class ConsensusEngine:
             reasoning=reasoning,
         )
 
-    def _calibrate_votes(self, votes: List[Vote]) -> List[Vote]:
-        """Apply confidence calibration to votes"""
-        if self.confidence_calibration == 1.0:
-            return votes
-
-        calibrated = []
-        for vote in votes:
-            calib_vote = Vote(
-                agent_id=vote.agent_id,
-                decision=vote.decision,
-                confidence=min(1.0, vote.confidence * self.confidence_calibration),
-                reasoning=vote.reasoning,
-            )
-            calibrated.append(calib_vote)
-        return calibrated
+    def collect_pairwise(self, utilities: np.ndarray) -> PairwiseResult:
+        """
+        Pick the candidate output that agrees most with all the others.
+
+        Each candidate i is scored s_i = mean over j != i of U[i, j], and the
+        highest-scoring candidate wins (ties go to the lowest index).
+
+        Args:
+            utilities: (N, N) matrix where U[i, j] is the pairwise
+                       utility/agreement of candidate i with candidate j.
+                       The diagonal is ignored.
+
+        Returns:
+            PairwiseResult with the winning index and all scores
+        """
+        u = np.asarray(utilities, dtype=np.float64)
+        if u.ndim != 2 or u.shape[0] != u.shape[1]:
+            raise ValueError(f"Expected a square utility matrix, got shape {u.shape}")
+        n = u.shape[0]
+        if n < 2:
+            raise ValueError("Pairwise consensus needs at least 2 candidates")
+
+        scores = (u.sum(axis=1) - u.diagonal()) / (n - 1)
+        return PairwiseResult(
+            best_index=int(scores.argmax()),
+            scores=scores.tolist(),
+        )
+
+    def _vectorize(self, votes: List[Vote]) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract (decisions, calibrated confidences) arrays from votes"""
+        dec_arr = np.fromiter(
+            (v._value for v in votes), dtype=np.int8, count=len(votes)
+        )
+        return dec_arr, self._calibrated_confidences(votes)
+
+    def _calibrated_confidences(self, votes: List[Vote]) -> np.ndarray:
+        """
+        Apply confidence calibration without rebuilding Vote objects.
+
+        The original votes are left untouched; only the returned array
+        carries the scaled (and clipped) confidences.
+        """
+        conf_arr = np.fromiter(
+            (v.confidence for v in votes), dtype=np.float64, count=len(votes)
+        )
+        if self.confidence_calibration != 1.0:
+            conf_arr *= self.confidence_calibration
+            np.minimum(conf_arr, 1.0, out=conf_arr)
+        return conf_arr
+
+    def _aggregate(
+        self, dec_arr: np.ndarray, conf_arr: np.ndarray
+    ) -> Tuple[float, float, float, int, int, int]:
+        """
+        Reduce decisions/confidences to the scalars every summary needs.
+
+        Returns:
+            (weighted_sum, yes_weight, no_weight, yes_count, no_count, abstain_count)
+        """
+        if len(dec_arr) >= NUMBA_MIN_VOTES:
+            kernel = _get_numba_aggregate()
+            if kernel is not None:
+                s, yw, nw, yc, nc, ac = kernel(dec_arr, conf_arr)
+                return float(s), float(yw), float(nw), int(yc), int(nc), int(ac)
+
+        # Shift -1/0/1 to 0/1/2 so bins index NO/ABSTAIN/YES
+        bins = dec_arr + 1
+        no_weight, _, yes_weight = np.bincount(
+            bins, weights=conf_arr, minlength=3
+        ).tolist()
+        no_count, abstain_count, yes_count = np.bincount(bins, minlength=3).tolist()
+        weighted_sum = yes_weight - no_weight
+        return weighted_sum, yes_weight, no_weight, yes_count, no_count, abstain_count
 
     def _decide_from_score(self, weighted_sum: float) -> Decision:
         """Convert weighted sum to decision"""
@@ -146,19 +359,12 @@ class ConsensusEngine:
         else:
             return Decision.ABSTAIN
 
-    def _calculate_confidence(self, votes: List[Vote]) -> float:
+    def _calculate_confidence(self, yes_weight: float, no_weight: float) -> float:
         """
         Calculate confidence as unanimity metric.
         - 1.0 = perfect unanimity
         - 0.0 = perfect split
         """
-        if not votes:
-            return 0.0
-
-        yes_weight = sum(
-            v.confidence for v in votes if v.decision == Decision.YES
-        )
-        no_weight = sum(v.confidence for v in votes if v.decision == Decision.NO)
         total_weight = yes_weight + no_weight
 
         if total_weight == 0:
@@ -168,33 +374,22 @@ class ConsensusEngine:
         confidence = (max_weight - (total_weight - max_weight)) / total_weight
         return max(0.0, min(1.0, confidence))
 
-    def _count_votes(self, votes: List[Vote]) -> Dict[str, int]:
-        """Count votes by type"""
-        counts = {"YES": 0, "NO": 0, "ABSTAIN": 0}
-        for vote in votes:
-            counts[vote.decision.name] += 1
-        return counts
-
     def _generate_reasoning(
         self,
-        votes: List[Vote],
         weighted_sum: float,
         decision: Decision,
         confidence: float,
+        yes_weight: float,
+        no_weight: float,
+        vote_breakdown: Dict[str, int],
     ) -> str:
         """Generate human-readable reasoning for decision"""
-        yes_votes = [v for v in votes if v.decision == Decision.YES]
-        no_votes = [v for v in votes if v.decision == Decision.NO]
-
-        yes_weight = sum(v.confidence for v in yes_votes)
-        no_weight = sum(v.confidence for v in no_votes)
-
         reasoning = (
             f"Decision: {decision.name} | "
             f"Weighted score: {weighted_sum:.2f} | "
             f"Unanimity: {confidence:.1%} | "
-            f"Pro ({yes_weight:.2f}): {len(yes_votes)} agents | "
-            f"Con ({no_weight:.2f}): {len(no_votes)} agents"
+            f"Pro ({yes_weight:.2f}): {vote_breakdown['YES']} agents | "
+            f"Con ({no_weight:.2f}): {vote_breakdown['NO']} agents"
         )
         return reasoning
 
@@ -210,9 +405,15 @@ class VotingStrategy(ABC):
 
 # Utility functions for multi-agent integration
 
+@lru_cache(maxsize=32)
+def _engine(calibration: float) -> ConsensusEngine:
+    """Shared engine per calibration (engines hold no per-call state)"""
+    return ConsensusEngine(confidence_calibration=calibration)
+
+
 def run_consensus(votes: List[Vote], calibration: float = 1.0) -> ConsensusResult:
     """
-    Convenience function: create engine and run voting in one call.
+    Convenience function: run voting on a shared engine in one call.
 
     Args:
         votes: List of Vote objects
@@ -221,8 +422,7 @@ def run_consensus(votes: List[Vote], calibration: float = 1.0) -> ConsensusResul
     Returns:
         ConsensusResult
     """
-    engine = ConsensusEngine(confidence_calibration=calibration)
-    return engine.collect_votes(votes)
+    return _engine(calibration).collect_votes(votes)
 
 
 def votes_from_dict(data: List[Dict[str, Any]]) -> List[Vote]:
@@ -238,3 +438,30 @@ def votes_from_dict(data: List[Dict[str, Any]]) -> List[Vote]:
         )
         votes.append(vote)
     return votes
+
+
+def votes_from_json_bulk(
+    raw: Union[bytes, str],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse a JSON array of votes straight into columns (no Vote objects).
+
+    Args:
+        raw: JSON text/bytes, same shape as votes_from_dict input
+
+    Returns:
+        (agent_ids, decisions, confidences) arrays, ready for
+        ConsensusEngine.collect_arrays
+    """
+    data = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    n = len(data)
+    agent_ids = np.array([item["agent_id"] for item in data], dtype=object)
+    decisions = np.fromiter(
+        (_DEC_CODE[item["decision"].upper()] for item in data),
+        dtype=np.int8,
+        count=n,
+    )
+    confidences = np.fromiter(
+        (item["confidence"] for item in data), dtype=np.float64, count=n
+    )
+    return agent_ids, decisions, confidences
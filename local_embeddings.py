@@ -5,7 +5,11 @@ Reference implementation for the local-embeddings skill.
 Supports fast (MiniLM), accurate (Nomic), and hybrid tiers with OpenAI fallback.
 """
 
+import asyncio
+import hashlib
+import os
 import time
+from collections import OrderedDict
 import numpy as np
 from typing import Union, List, Tuple, Optional, Dict, Any
 import warnings
@@ -24,6 +28,12 @@ try:
 except ImportError:
     HAS_OPENAI = False
 
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
 
 # ============================================================================
 # Exceptions
@@ -79,6 +89,42 @@ MODEL_REGISTRY = {
 }
 
 
+def _cache_key(tier: str, text: str) -> Tuple[str, bytes]:
+    """Embedding cache key: tier plus a digest of the full text."""
+    return tier, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+OPENAI_BATCH_TOKENS = 2048  # Approximate tokens per concurrent request
+
+
+def _split_by_tokens(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """Greedily group texts into sub-batches of roughly max_tokens each."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for text in texts:
+        tokens = len(text) // 4 + 1  # 1 token ≈ 4 chars
+        if current and current_tokens + tokens > max_tokens:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _in_event_loop() -> bool:
+    """True when called from inside a running asyncio loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
 # ============================================================================
 # LocalEmbedder: Main Class
 # ============================================================================
@@ -102,6 +148,9 @@ class LocalEmbedder:
         latency_target_ms: float = 50,
         batch_size: int = 32,
         enable_caching: bool = True,
+        max_cache_size: int = 10000,
+        quantize_cache: bool = False,
+        use_fp16: Optional[bool] = None,
     ):
         """
         Initialize LocalEmbedder.
@@ -115,6 +164,12 @@ class LocalEmbedder:
             latency_target_ms: Target latency for auto-tier selection
             batch_size: Batch size for inference
             enable_caching: Cache embeddings for identical inputs
+            max_cache_size: Max cached embeddings (least recently used evicted)
+            quantize_cache: Store cached embeddings as int8 (4x smaller); cache
+                            hits then return the int8-reconstructed vector,
+                            not the exact first result (default: off)
+            use_fp16: Load model weights in float16 (default: on for cuda/mps,
+                      off for cpu where fp16 matmuls are slower)
         """
         if not HAS_SENTENCE_TRANSFORMERS and tier != "openai":
             raise LocalEmbeddingError(
@@ -126,15 +181,21 @@ class LocalEmbedder:
         self.device = device
         self.batch_size = batch_size
         self.enable_caching = enable_caching
+        self.max_cache_size = max_cache_size
+        self.quantize_cache = quantize_cache
+        self.use_fp16 = device != "cpu" if use_fp16 is None else use_fp16
         self.fallback_to_openai = fallback_to_openai
         self.latency_target_ms = latency_target_ms
         
         # Model cache
         self._models: Dict[str, Any] = {}
-        self._embedding_cache: Dict[str, np.ndarray] = {} if enable_caching else None
+        self._embedding_cache: Optional[OrderedDict] = (
+            OrderedDict() if enable_caching else None
+        )
         
         # OpenAI setup
-        if openai_api_key:
+        self._openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
+        if openai_api_key and HAS_OPENAI:
             openai.api_key = openai_api_key
     
     def _load_model(self, tier: str) -> SentenceTransformer:
@@ -145,12 +206,20 @@ class LocalEmbedder:
             
             try:
                 model_info = MODEL_REGISTRY[tier]
-                self._models[tier] = SentenceTransformer(
+                model = SentenceTransformer(
                     model_info["repo"],
                     device=self.device,
                 )
             except Exception as e:
                 raise ModelNotFoundError(f"Failed to load {tier}: {e}")
+            
+            if self.use_fp16:
+                # Halves weight bytes per matmul; keep fp32 if unsupported
+                try:
+                    model = model.half()
+                except Exception as e:
+                    warnings.warn(f"float16 unavailable for {tier}, using float32: {e}")
+            self._models[tier] = model
         
         return self._models[tier]
     
@@ -174,6 +243,22 @@ class LocalEmbedder:
             Embeddings of shape (n_texts, embedding_dim) or (embedding_dim,)
             If return_latency=True: (embeddings, latency_ms)
         """
+        # Determine tier
+        tier = use_tier or self.tier
+        if tier == "hybrid":
+            tier = self._select_tier(
+                [texts] if isinstance(texts, str) else texts, context_length
+            )
+        
+        # Single-text fast path (local tiers): no index bookkeeping or merge
+        if isinstance(texts, str) and tier != "openai":
+            start_ns = time.perf_counter_ns()
+            embedding = self._embed_one(texts, tier)
+            latency_ms = (time.perf_counter_ns() - start_ns) * 1e-6
+            if return_latency:
+                return embedding, latency_ms
+            return embedding
+        
         # Normalize input
         if isinstance(texts, str):
             texts = [texts]
@@ -181,48 +266,52 @@ class LocalEmbedder:
         else:
             squeeze = False
         
-        # Determine tier
-        tier = use_tier or self.tier
-        if tier == "hybrid":
-            tier = self._select_tier(texts, context_length)
-        
         # Check cache
-        cache_keys = [f"{tier}:{t[:50]}" for t in texts] if self.enable_caching else None
+        cache_keys = [_cache_key(tier, t) for t in texts] if self.enable_caching else None
         cached = []
+        cached_indices = []
         uncached_indices = []
         
         if self.enable_caching:
             for i, key in enumerate(cache_keys):
-                if key in self._embedding_cache:
-                    cached.append(self._embedding_cache[key])
+                hit = self._cache_get(key)
+                if hit is not None:
+                    cached_indices.append(i)
+                    cached.append(hit)
                 else:
                     uncached_indices.append(i)
         else:
             uncached_indices = list(range(len(texts)))
         
         # Embed
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         if tier == "openai":
             embeddings = self._embed_openai(texts)
         else:
             try:
                 model = self._load_model(tier)
-                uncached_texts = [texts[i] for i in uncached_indices]
-                uncached_embeds = model.encode(uncached_texts, batch_size=self.batch_size)
                 
-                # Restore order and merge cache
-                if self.enable_caching:
-                    embeddings = [None] * len(texts)
-                    for cached_idx, cached_embed in enumerate(cached):
-                        embeddings[cached_idx] = cached_embed
-                    for uncached_idx_pos, uncached_idx in enumerate(uncached_indices):
-                        embeddings[uncached_idx] = uncached_embeds[uncached_idx_pos]
-                        # Cache it
-                        self._embedding_cache[cache_keys[uncached_idx]] = uncached_embeds[uncached_idx_pos]
-                    embeddings = np.array(embeddings)
-                else:
-                    embeddings = uncached_embeds
+                # Fill a preallocated output in place (no list -> ndarray copy)
+                embeddings = np.empty(
+                    (len(texts), MODEL_REGISTRY[tier]["dimensions"]),
+                    dtype=np.float32,
+                )
+                if uncached_indices:
+                    # L2-normalize at encode time so cached vectors are unit length
+                    uncached_embeds = model.encode(
+                        [texts[i] for i in uncached_indices],
+                        batch_size=self.batch_size,
+                        convert_to_numpy=True,
+                        normalize_embeddings=True,
+                        show_progress_bar=False,
+                    )
+                    embeddings[uncached_indices] = uncached_embeds
+                    if self.enable_caching:
+                        for pos, i in enumerate(uncached_indices):
+                            self._cache_put(cache_keys[i], uncached_embeds[pos])
+                for i, cached_embed in zip(cached_indices, cached):
+                    embeddings[i] = cached_embed
             except Exception as e:
                 if self.fallback_to_openai:
                     print(f"Local embedding failed: {e}. Falling back to OpenAI.")
@@ -230,7 +319,7 @@ class LocalEmbedder:
                 else:
                     raise LocalEmbeddingError(f"Embedding failed with tier {tier}: {e}")
         
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (time.perf_counter_ns() - start_ns) * 1e-6
         
         # Squeeze if single input
         if squeeze:
@@ -240,6 +329,57 @@ class LocalEmbedder:
             return embeddings, latency_ms
         return embeddings
     
+    def _embed_one(self, text: str, tier: str) -> np.ndarray:
+        """Embed a single text with a local tier, going through the cache."""
+        key = _cache_key(tier, text) if self.enable_caching else None
+        if key is not None:
+            hit = self._cache_get(key)
+            if hit is not None:
+                return hit
+        
+        try:
+            embedding = self._load_model(tier).encode(
+                text,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            ).astype(np.float32, copy=False)
+        except Exception as e:
+            if self.fallback_to_openai:
+                print(f"Local embedding failed: {e}. Falling back to OpenAI.")
+                return self._embed_openai([text])[0]
+            raise LocalEmbeddingError(f"Embedding failed with tier {tier}: {e}")
+        
+        if key is not None:
+            self._cache_put(key, embedding)
+        return embedding
+    
+    def _cache_get(self, key: Tuple[str, bytes]) -> Optional[np.ndarray]:
+        """Look up a cached embedding, marking it most recently used."""
+        hit = self._embedding_cache.get(key)
+        if hit is None:
+            return None
+        self._embedding_cache.move_to_end(key)
+        if self.quantize_cache:
+            q, scale = hit
+            return q.astype(np.float32) * scale
+        # Copy so a caller mutating its result can't corrupt the cache
+        return hit.copy()
+    
+    def _cache_put(self, key: Tuple[str, bytes], embedding: np.ndarray) -> None:
+        """Cache an embedding, evicting the least recently used past the limit."""
+        if self.quantize_cache:
+            # Symmetric per-vector int8 quantization: 1 byte per dim + a scale
+            scale = float(np.abs(embedding).max()) / 127.0 or 1.0
+            embedding = (np.round(embedding / scale).astype(np.int8), scale)
+        else:
+            # Own the data: callers may mutate theirs, and batch rows are views
+            embedding = embedding.copy()
+        self._embedding_cache[key] = embedding
+        self._embedding_cache.move_to_end(key)
+        if len(self._embedding_cache) > self.max_cache_size:
+            self._embedding_cache.popitem(last=False)
+    
     def _select_tier(self, texts: List[str], context_length: Optional[int]) -> str:
         """Auto-select tier based on text characteristics."""
         # Estimate token count (rough approximation: 1 token ≈ 4 chars)
@@ -257,18 +397,48 @@ class LocalEmbedder:
     
     def _embed_openai(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings using OpenAI API."""
+        # Concurrent sub-batches over httpx when possible; asyncio.run can't
+        # nest inside a running loop, so those callers use the SDK path.
+        if HAS_HTTPX and self._openai_api_key and not _in_event_loop():
+            return asyncio.run(self._embed_openai_async(texts))
+        
         if not HAS_OPENAI:
             raise LocalEmbeddingError("OpenAI not installed. Install with: pip install openai")
         
         try:
             response = openai.Embedding.create(
                 input=texts,
-                model="text-embedding-3-small"
+                model=OPENAI_EMBEDDING_MODEL
             )
             return np.array([item["embedding"] for item in response["data"]])
         except Exception as e:
             raise LocalEmbeddingError(f"OpenAI embedding failed: {e}")
     
+    async def _embed_openai_async(self, texts: List[str]) -> np.ndarray:
+        """Generate OpenAI embeddings with one concurrent request per sub-batch."""
+        batches = _split_by_tokens(texts, OPENAI_BATCH_TOKENS)
+        headers = {"Authorization": f"Bearer {self._openai_api_key}"}
+        
+        try:
+            async with httpx.AsyncClient(headers=headers, timeout=60.0) as client:
+                parts = await asyncio.gather(
+                    *(self._post_openai_batch(client, batch) for batch in batches)
+                )
+        except (httpx.HTTPError, KeyError, ValueError) as e:
+            raise LocalEmbeddingError(f"OpenAI embedding failed: {e}")
+        
+        return np.concatenate(parts)
+    
+    async def _post_openai_batch(self, client: "httpx.AsyncClient", batch: List[str]) -> np.ndarray:
+        """POST one sub-batch to the embeddings endpoint."""
+        response = await client.post(
+            OPENAI_EMBEDDINGS_URL,
+            json={"input": batch, "model": OPENAI_EMBEDDING_MODEL},
+        )
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda item: item["index"])
+        return np.array([item["embedding"] for item in data], dtype=np.float32)
+    
     def similarity(
         self,
         text1: str,
@@ -284,11 +454,14 @@ class LocalEmbedder:
         
         Returns:
             Similarity score
+        
+        Embeddings are L2-normalized when generated (and cached that way),
+        so cosine similarity is a single dot product.
         """
         embed1, embed2 = self.embed([text1, text2])
         
         if metric == "cosine":
-            return np.dot(embed1, embed2) / (np.linalg.norm(embed1) * np.linalg.norm(embed2))
+            return float(embed1 @ embed2)
         elif metric == "euclidean":
             return -np.linalg.norm(embed1 - embed2)
         elif metric == "dot":
@@ -323,13 +496,21 @@ class LocalEmbedder:
             except ImportError:
                 pass
         
-        embeddings = []
+        # Output is allocated once the first batch reveals the embedding
+        # width (hybrid/openai tiers aren't known up front), then filled by slice
+        embeddings = None
         for i in range(0, len(texts), batch_size):
             batch = texts[i:i+batch_size]
             batch_embeds = self.embed(batch)
-            embeddings.extend(batch_embeds)
+            if embeddings is None:
+                embeddings = np.empty(
+                    (len(texts), batch_embeds.shape[1]), dtype=batch_embeds.dtype
+                )
+            embeddings[i:i+len(batch)] = batch_embeds
         
-        return np.array(embeddings)
+        if embeddings is None:
+            return np.empty(0, dtype=np.float32)
+        return embeddings
     
     def switch_tier(self, tier: str, force: bool = False) -> None:
         """Switch embedding tier at runtime."""
@@ -5,10 +5,25 @@ Orchestrates consensus decisions across multiple agents in a multi-agent system.
 Handles agent prompting, vote collection, and decision routing.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
 from enum import Enum
+import asyncio
+import contextvars
+import functools
+import hashlib
 import json
+import threading
+import time
+
+# Optional imports (graceful degradation)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from consensus_engine import (
     ConsensusEngine,
@@ -18,6 +33,11 @@ from consensus_engine import (
 )
 
 
+def _qid(*parts: str) -> str:
+    """Stable question-id digest (unlike hash(), identical across processes)"""
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+
+
 class DecisionContext(Enum):
     """Categories of decisions requiring consensus"""
     TOOL_SELECTION = "tool_selection"
@@ -27,7 +47,7 @@ class DecisionContext(Enum):
     CONFLICT_RESOLUTION = "conflict_resolution"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConsensusQuestion:
     """A decision that requires agent consensus"""
     question_id: str
@@ -37,7 +57,7 @@ class ConsensusQuestion:
     metadata: Dict[str, Any] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentVoteResponse:
     """Agent's response to a consensus question"""
     agent_id: str
@@ -46,6 +66,64 @@ class AgentVoteResponse:
     reasoning: str
 
 
+# Executor for sync collectors; None means the loop's default executor
+_collector_executor: contextvars.ContextVar[Optional[ThreadPoolExecutor]] = (
+    contextvars.ContextVar("_collector_executor", default=None)
+)
+
+
+async def _call_collector(
+    collector: Callable,
+    agent_id: str,
+    prompt: str,
+    timeout_seconds: Optional[float],
+) -> Any:
+    """Call a sync (in a worker thread) or async collector with a timeout"""
+    if asyncio.iscoroutinefunction(collector):
+        call = collector(agent_id, prompt)
+    else:
+        call = asyncio.get_running_loop().run_in_executor(
+            _collector_executor.get(),
+            functools.partial(
+                contextvars.copy_context().run, collector, agent_id, prompt
+            ),
+        )
+    return await asyncio.wait_for(call, timeout_seconds)
+
+
+def _run_sync(coro_fn: Callable, *args: Any) -> Any:
+    """
+    asyncio.run(coro_fn(*args)) with sync collectors on a private pool.
+
+    asyncio.run joins the loop's default executor on shutdown, so a
+    timed-out or cancelled collector thread would hold up the caller until
+    it finished. The private pool is abandoned instead: stragglers run to
+    completion in the background and their results are discarded.
+    """
+    executor = ThreadPoolExecutor(thread_name_prefix="vote-collector")
+    token = _collector_executor.set(executor)
+    try:
+        return asyncio.run(coro_fn(*args))
+    finally:
+        _collector_executor.reset(token)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _batch_prompt(labeled: List[Tuple[str, ConsensusQuestion]]) -> str:
+    """One prompt asking for a JSON array of votes, one per (label, question)"""
+    numbered = "\n\n".join(
+        f"{i}. [qid: {label}]\n{q.prompt}"
+        for i, (label, q) in enumerate(labeled, start=1)
+    )
+    return (
+        f"Answer each of the following {len(labeled)} questions.\n\n"
+        f"{numbered}\n\n"
+        "Respond with only a JSON array, one object per question: "
+        '[{"qid": "<qid>", "decision": "YES" or "NO", '
+        '"confidence": 0.0-1.0, "reasoning": "..."}]'
+    )
+
+
 class MultiAgentOrchestrator:
     """
     Orchestrates consensus voting across multiple agents.
@@ -63,6 +141,11 @@ class MultiAgentOrchestrator:
         agents: List[str],
         vote_collector: Optional[Callable] = None,
         confidence_calibration: float = 1.0,
+        early_stop: bool = False,
+        history_path: Optional[str] = None,
+        cache_ttl_seconds: Optional[float] = None,
+        batch_collector: Optional[Callable] = None,
+        cache_max_entries: int = 1024,
     ):
         """
         Initialize orchestrator.
@@ -73,23 +156,80 @@ class MultiAgentOrchestrator:
                            Signature: vote_collector(agent_id: str, question: str) -> AgentVoteResponse
                            If None, uses stub that requires manual vote injection.
             confidence_calibration: Passed to ConsensusEngine
+            early_stop: Stop polling once the outstanding agents can no longer
+                        change the final decision; their votes become abstentions
+            history_path: Optional JSON Lines file; each decision is appended
+                          to it as it is logged
+            cache_ttl_seconds: Reuse a result for the same question (id and
+                               prompt) and agent set for this long instead
+                               of re-polling (default: no caching)
+            batch_collector: Optional function for run_batched that answers
+                             several questions in one call.
+                             Signature: batch_collector(agent_id: str, prompt: str) -> str
+                             (raw JSON reply; may be async)
+            cache_max_entries: Most results kept for cache_ttl_seconds; the
+                               oldest are evicted first
         """
         self.agents = agents
         self.vote_collector = vote_collector
+        self.batch_collector = batch_collector
+        self.early_stop = early_stop
         self.engine = ConsensusEngine(confidence_calibration=confidence_calibration)
-        self.history: List[Dict[str, Any]] = []
+        # deque.append is atomic, so concurrent rounds log without a lock
+        self.history: Deque[Dict[str, Any]] = deque()
+        self._engine_lock = threading.Lock()
+        self.history_path = history_path
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        # Insertion order is storage order, so expired entries sit at the front
+        self._result_cache: OrderedDict[
+            Tuple[str, str, FrozenSet[str]], Tuple[float, ConsensusResult]
+        ] = OrderedDict()
 
     def run_consensus(
         self,
         question: ConsensusQuestion,
-        timeout_seconds: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
     ) -> ConsensusResult:
         """
         Run full consensus workflow: prompt agents, collect votes, decide.
 
+        Synchronous wrapper around run_consensus_async (cannot be called
+        from inside a running event loop; await run_consensus_async there).
+        Returns as soon as the round is decided, without waiting for sync
+        collectors that timed out or were cancelled.
+
         Args:
             question: The decision to make
-            timeout_seconds: Max time to wait for all votes (not enforced in this stub)
+            timeout_seconds: Max time to wait for each agent's vote
+
+        Returns:
+            ConsensusResult with final decision
+        """
+        return _run_sync(self.run_consensus_async, question, timeout_seconds)
+
+    async def run_consensus_async(
+        self,
+        question: ConsensusQuestion,
+        timeout_seconds: Optional[float] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+    ) -> ConsensusResult:
+        """
+        Prompt all agents concurrently, collect votes, decide.
+
+        Sync vote collectors run in worker threads; async collectors are
+        awaited directly. An agent that raises or times out is counted as
+        an abstention instead of failing the whole round.
+
+        Outstanding agents are cancelled (and abstain) once cancel_event is
+        set, or with early_stop once their votes can no longer flip the
+        outcome. Cancelling a sync collector only stops waiting for it; the
+        worker thread itself runs to completion.
+
+        Args:
+            question: The decision to make
+            timeout_seconds: Max time to wait for each agent's vote
+            cancel_event: Shared event that aborts the remaining agents when set
 
         Returns:
             ConsensusResult with final decision
@@ -100,21 +240,309 @@ class MultiAgentOrchestrator:
                 "or use inject_votes() for manual testing."
             )
 
-        # Prompt all agents
-        votes = []
-        for agent_id in self.agents:
-            response = self.vote_collector(agent_id, question.prompt)
-            vote = self._response_to_vote(response)
-            votes.append(vote)
+        cache_key = self._cache_key(question)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            return cached
+
+        # Prompt all agents at once; wall time is the slowest agent, not the sum
+        pending = {
+            asyncio.create_task(
+                self._collect_vote(agent_id, question.prompt, timeout_seconds)
+            ): agent_id
+            for agent_id in self.agents
+        }
+        cancel_waiter = (
+            asyncio.create_task(cancel_event.wait()) if cancel_event else None
+        )
+        received: Dict[str, Vote] = {}
+        tally = 0.0
+
+        try:
+            while pending:
+                waiting = set(pending)
+                if cancel_waiter:
+                    waiting.add(cancel_waiter)
+                done, _ = await asyncio.wait(
+                    waiting, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task is cancel_waiter:
+                        continue
+                    agent_id = pending.pop(task)
+                    error = task.exception()
+                    vote = (
+                        self._abstain_vote(agent_id, error)
+                        if error
+                        else self._response_to_vote(task.result())
+                    )
+                    received[agent_id] = vote
+                    tally += self._calibrated_weight(vote)
+
+                if cancel_waiter and cancel_waiter.done():
+                    break
+                if self.early_stop and self._outcome_settled(tally, len(pending)):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            if cancel_waiter:
+                cancel_waiter.cancel()
+
+        votes = [
+            received.get(agent_id)
+            or self._abstain_vote(agent_id, asyncio.CancelledError())
+            for agent_id in self.agents
+        ]
 
         # Compute consensus
-        result = self.engine.collect_votes(votes)
+        result = self._decide(votes)
 
         # Log to history
         self._log_decision(question, result)
 
+        self._cache_result(cache_key, result)
+
+        return result
+
+    def _decide(self, votes: List[Vote]) -> ConsensusResult:
+        """Score votes; serialized so concurrent rounds share one engine safely"""
+        with self._engine_lock:
+            return self.engine.collect_votes(votes)
+
+    def _cache_key(
+        self, question: ConsensusQuestion
+    ) -> Tuple[str, str, FrozenSet[str]]:
+        """
+        Result-cache key for a question under the current agent set.
+
+        question_id alone is not enough: the make_*_question helpers derive
+        it from the options only, so the same candidates for a different
+        task share an id. The prompt digest keeps those apart.
+        """
+        return (
+            question.question_id,
+            _qid(question.context.value, question.prompt),
+            frozenset(self.agents),
+        )
+
+    def _cached_result(
+        self, cache_key: Tuple[str, str, FrozenSet[str]]
+    ) -> Optional[ConsensusResult]:
+        """Return a still-fresh cached result for this question/agent set"""
+        if not self.cache_ttl_seconds:
+            return None
+        entry = self._result_cache.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.cache_ttl_seconds:
+            del self._result_cache[cache_key]
+            return None
         return result
 
+    def _cache_result(
+        self, cache_key: Tuple[str, str, FrozenSet[str]], result: ConsensusResult
+    ) -> None:
+        """Store a result, evicting expired entries and any beyond cache_max_entries"""
+        if not self.cache_ttl_seconds:
+            return
+        cache = self._result_cache
+        # Entries for a previous agent set can never hit again; drop them
+        for key in [key for key in cache if key[2] != cache_key[2]]:
+            del cache[key]
+
+        now = time.monotonic()
+        cache.pop(cache_key, None)
+        cache[cache_key] = (now, result)
+        while cache:
+            oldest_key, (stored_at, _) = next(iter(cache.items()))
+            if (
+                len(cache) <= self.cache_max_entries
+                and now - stored_at <= self.cache_ttl_seconds
+            ):
+                break
+            del cache[oldest_key]
+
+    def _calibrated_weight(self, vote: Vote) -> float:
+        """Signed vote weight as the engine will score it"""
+        calibrated = min(1.0, vote.confidence * self.engine.confidence_calibration)
+        return vote.decision * calibrated
+
+    def _outcome_settled(self, tally: float, outstanding: int) -> bool:
+        """True if the outstanding agents cannot change the sign of the tally"""
+        max_swing = outstanding * min(1.0, self.engine.confidence_calibration)
+        return abs(tally) > max_swing
+
+    async def _collect_vote(
+        self,
+        agent_id: str,
+        prompt: str,
+        timeout_seconds: Optional[float],
+    ) -> AgentVoteResponse:
+        """Ask one agent for its vote without blocking the event loop"""
+        return await _call_collector(
+            self.vote_collector, agent_id, prompt, timeout_seconds
+        )
+
+    def run_batched(
+        self,
+        questions: List[ConsensusQuestion],
+        timeout_seconds: Optional[float] = None,
+    ) -> List[ConsensusResult]:
+        """
+        Decide several questions with one batch_collector call per agent.
+
+        Synchronous wrapper around run_batched_async.
+
+        Args:
+            questions: Decisions to make
+            timeout_seconds: Max time to wait for each agent's reply
+
+        Returns:
+            ConsensusResult for each question, in order
+        """
+        return _run_sync(self.run_batched_async, questions, timeout_seconds)
+
+    async def run_batched_async(
+        self,
+        questions: List[ConsensusQuestion],
+        timeout_seconds: Optional[float] = None,
+    ) -> List[ConsensusResult]:
+        """
+        Decide several questions with one batch_collector call per agent.
+
+        Each agent gets a single prompt listing every question and replies
+        with a JSON array of votes, so K questions cost N round trips
+        instead of K*N. Questions an agent's reply doesn't answer (or all
+        of them, if the reply isn't valid JSON) fall back to per-question
+        vote_collector calls; without a vote_collector they abstain.
+
+        Questions are told apart by their full cache key, not question_id
+        alone: the make_*_question ids ignore the task text, so different
+        questions can share one. Those get distinct qid labels in the batch
+        prompt; exact repeats are asked once and share a result.
+
+        Without a batch_collector this just runs each question through
+        run_consensus_async.
+
+        Args:
+            questions: Decisions to make
+            timeout_seconds: Max time to wait for each agent's reply
+
+        Returns:
+            ConsensusResult for each question, in order
+        """
+        if not self.batch_collector:
+            return [
+                await self.run_consensus_async(question, timeout_seconds)
+                for question in questions
+            ]
+
+        keys = [self._cache_key(question) for question in questions]
+        results: Dict[Tuple[str, str, FrozenSet[str]], ConsensusResult] = {}
+        pending: Dict[Tuple[str, str, FrozenSet[str]], Tuple[str, ConsensusQuestion]] = {}
+        labels = set()
+        for question, key in zip(questions, keys):
+            if key in results or key in pending:
+                continue
+            cached = self._cached_result(key)
+            if cached is not None:
+                results[key] = cached
+                continue
+            # Unique qid label per distinct question in this batch
+            label, n = question.question_id, 1
+            while label in labels:
+                n += 1
+                label = f"{question.question_id}#{n}"
+            labels.add(label)
+            pending[key] = (label, question)
+
+        if pending:
+            labeled = list(pending.values())
+            prompt = _batch_prompt(labeled)
+            per_agent = await asyncio.gather(
+                *(
+                    self._collect_batch(agent_id, prompt, labeled, timeout_seconds)
+                    for agent_id in self.agents
+                )
+            )
+            for key, (label, question) in pending.items():
+                votes = [answers[label] for answers in per_agent]
+                result = self._decide(votes)
+                self._log_decision(question, result)
+                self._cache_result(key, result)
+                results[key] = result
+
+        return [results[key] for key in keys]
+
+    async def _collect_batch(
+        self,
+        agent_id: str,
+        prompt: str,
+        labeled: List[Tuple[str, ConsensusQuestion]],
+        timeout_seconds: Optional[float],
+    ) -> Dict[str, Vote]:
+        """One agent's votes for every question, keyed by batch label"""
+        try:
+            reply = await _call_collector(
+                self.batch_collector, agent_id, prompt, timeout_seconds
+            )
+            answers = self._parse_batch_reply(
+                agent_id, reply, [label for label, _ in labeled]
+            )
+        except Exception:
+            answers = {}
+
+        # Ask separately for anything the batched reply didn't cover
+        missing = [(label, q) for label, q in labeled if label not in answers]
+        if missing and self.vote_collector:
+            responses = await asyncio.gather(
+                *(
+                    self._collect_vote(agent_id, q.prompt, timeout_seconds)
+                    for _, q in missing
+                ),
+                return_exceptions=True,
+            )
+        else:
+            responses = [RuntimeError("no vote in batched reply")] * len(missing)
+
+        votes = {label: self._response_to_vote(r) for label, r in answers.items()}
+        for (label, _), response in zip(missing, responses):
+            votes[label] = (
+                self._abstain_vote(agent_id, response)
+                if isinstance(response, BaseException)
+                else self._response_to_vote(response)
+            )
+        return votes
+
+    def _parse_batch_reply(
+        self,
+        agent_id: str,
+        reply: Any,
+        labels: Sequence[str],
+    ) -> Dict[str, AgentVoteResponse]:
+        """Parse a JSON array of votes keyed by qid label; malformed entries are dropped"""
+        data = orjson.loads(reply) if HAS_ORJSON else json.loads(reply)
+        if not isinstance(data, list):
+            return {}
+        wanted = set(labels)
+        answers: Dict[str, AgentVoteResponse] = {}
+        for item in data:
+            try:
+                qid = str(item["qid"])
+                response = AgentVoteResponse(
+                    agent_id=agent_id,
+                    decision=str(item["decision"]),
+                    confidence=float(item["confidence"]),
+                    reasoning=str(item.get("reasoning", "")),
+                )
+            except (TypeError, KeyError, ValueError, AttributeError):
+                continue
+            if qid in wanted:
+                answers.setdefault(qid, response)
+        return answers
+
     def inject_votes(
         self,
         question: ConsensusQuestion,
@@ -131,7 +559,7 @@ class MultiAgentOrchestrator:
             ConsensusResult
         """
         vote_objects = [self._response_to_vote(v) for v in votes]
-        result = self.engine.collect_votes(vote_objects)
+        result = self._decide(vote_objects)
         self._log_decision(question, result)
         return result
 
@@ -145,6 +573,21 @@ class MultiAgentOrchestrator:
             reasoning=response.reasoning,
         )
 
+    def _abstain_vote(self, agent_id: str, error: BaseException) -> Vote:
+        """Record a failed or timed-out agent as an abstention"""
+        if isinstance(error, asyncio.CancelledError):
+            reason = "cancelled"
+        elif isinstance(error, asyncio.TimeoutError):
+            reason = "timed out"
+        else:
+            reason = repr(error)
+        return Vote(
+            agent_id=agent_id,
+            decision=Decision.ABSTAIN,
+            confidence=0.0,
+            reasoning=f"Vote collection failed: {reason}",
+        )
+
     def _log_decision(self, question: ConsensusQuestion, result: ConsensusResult) -> None:
         """Log decision to history"""
         entry = {
@@ -155,14 +598,39 @@ class MultiAgentOrchestrator:
         }
         self.history.append(entry)
 
-    def get_history(self) -> List[Dict[str, Any]]:
-        """Get all past decisions"""
-        return self.history
+        # O(1) per decision: append one line instead of rewriting the history
+        if self.history_path:
+            if HAS_ORJSON:
+                line = orjson.dumps(entry) + b"\n"
+            else:
+                line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+            with open(self.history_path, "ab") as f:
+                f.write(line)
+
+    def get_history(self) -> Sequence[Mapping[str, Any]]:
+        """
+        Get all past decisions, oldest first.
+
+        History is append-only; this is a read-only snapshot (one tuple
+        allocation), so callers need no defensive copy.
+        """
+        return tuple(self.history)
 
     def export_history_json(self, filepath: str) -> None:
-        """Export decision history to JSON"""
+        """
+        Export decision history as one pretty-printed JSON array.
+
+        A full rewrite; use history_path for incremental per-decision logging.
+        Encoded with orjson when available, otherwise json.dump streams the
+        encoding chunk by chunk.
+        """
+        history = list(self.history)
+        if HAS_ORJSON:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(history, option=orjson.OPT_INDENT_2))
+            return
         with open(filepath, "w") as f:
-            json.dump(self.history, f, indent=2)
+            json.dump(history, f, indent=2)
 
 
 # Common decision templates
@@ -183,7 +651,7 @@ def make_tool_selection_question(
     """
     tools_str = ", ".join(tool_candidates)
     return ConsensusQuestion(
-        question_id=f"tool_select_{hash(tuple(tool_candidates))}",
+        question_id=f"tool_select_{_qid(*tool_candidates)}",
         context=DecisionContext.TOOL_SELECTION,
         prompt=(
             f"Task: {task_description}\n\n"
@@ -214,7 +682,7 @@ def make_budget_decision_question(
         [f"  - {name}: {desc}" for name, desc in options.items()]
     )
     return ConsensusQuestion(
-        question_id=f"budget_{hash(tuple(options.keys()))}",
+        question_id=f"budget_{_qid(*options.keys())}",
         context=DecisionContext.BUDGET_ALLOCATION,
         prompt=(
             f"Budget decision. Constraint: {budget_constraint}\n\n"
@@ -244,7 +712,7 @@ def make_interpretation_dispute_question(
         ConsensusQuestion
     """
     return ConsensusQuestion(
-        question_id=f"interp_{hash(disputed_text)}",
+        question_id=f"interp_{_qid(disputed_text)}",
         context=DecisionContext.INTERPRETATION_DISPUTE,
         prompt=(
             f"Interpretation dispute:\n\n"
@@ -264,6 +732,7 @@ def make_interpretation_dispute_question(
 def build_voting_workflow(
     orchestrator: MultiAgentOrchestrator,
     decision_points: List[ConsensusQuestion],
+    max_concurrency: Optional[int] = None,
 ) -> List[ConsensusResult]:
     """
     Run a sequence of consensus decisions.
@@ -271,15 +740,49 @@ def build_voting_workflow(
     Args:
         orchestrator: The MultiAgentOrchestrator instance
         decision_points: List of questions to decide on
+        max_concurrency: Max questions polled at once (default: all)
 
     Returns:
         List of ConsensusResult for each decision
     """
-    results = []
-    for question in decision_points:
+    return _run_sync(
+        build_voting_workflow_async, orchestrator, decision_points, max_concurrency
+    )
+
+
+async def build_voting_workflow_async(
+    orchestrator: MultiAgentOrchestrator,
+    decision_points: List[ConsensusQuestion],
+    max_concurrency: Optional[int] = None,
+) -> List[ConsensusResult]:
+    """
+    Run independent consensus decisions concurrently.
+
+    Questions are fanned out together (on top of the per-question agent
+    fan-out), bounded by max_concurrency. A question that fails is reported
+    and skipped; results keep the order of decision_points.
+
+    Args:
+        orchestrator: The MultiAgentOrchestrator instance
+        decision_points: List of questions to decide on
+        max_concurrency: Max questions polled at once (default: all)
+
+    Returns:
+        List of ConsensusResult for each decision that succeeded
+    """
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    async def decide(question: ConsensusQuestion) -> Optional[ConsensusResult]:
         try:
-            result = orchestrator.run_consensus(question)
-            results.append(result)
+            if semaphore is None:
+                return await orchestrator.run_consensus_async(question)
+            async with semaphore:
+                return await orchestrator.run_consensus_async(question)
         except Exception as e:
             print(f"Error processing question {question.question_id}: {e}")
-    return results
+            return None
+
+    # decide() reports its own errors, so plain gather works without TaskGroup (3.11+)
+    results = await asyncio.gather(*(decide(question) for question in decision_points))
+
+    return [result for result in results if result is not None]
@@ -52,43 +52,46 @@ API Reference:
 __version__ = "1.0.0"
 __author__ = "OpenClaw Dynamic Tools System"
 
-# Import main components
-from .tool_loader import (
-    ToolLoader,
-    ToolVersion,
-    get_loader
-)
-
-from .tool_watcher import (
-    ToolWatcher,
-    FileWatcher,
-    get_watcher
-)
-
-from .capability_detector import (
-    CapabilityDetector,
-    CapabilityGap,
-    Intent,
-    detect_capability_gap
-)
-
-from .tool_generator import (
-    ToolGenerator,
-    create_tool_from_gap
-)
-
-from .tool_validator import (
-    ToolValidator,
-    ValidationResult,
-    validate_tool
-)
-
-from .orchestrator import (
-    DynamicToolOrchestrator,
-    CreationLog,
-    get_orchestrator,
-    create_tool_on_demand
-)
+import importlib
+
+# Main components are imported lazily (PEP 562) so that touching one
+# entry point does not pull in the watcher, generator and validator.
+_LAZY = {
+    "ToolLoader": ("tool_loader", "ToolLoader"),
+    "ToolVersion": ("tool_loader", "ToolVersion"),
+    "get_loader": ("tool_loader", "get_loader"),
+    "ToolWatcher": ("tool_watcher", "ToolWatcher"),
+    "FileWatcher": ("tool_watcher", "FileWatcher"),
+    "get_watcher": ("tool_watcher", "get_watcher"),
+    "CapabilityDetector": ("capability_detector", "CapabilityDetector"),
+    "CapabilityGap": ("capability_detector", "CapabilityGap"),
+    "CompiledDetector": ("capability_detector", "CompiledDetector"),
+    "Intent": ("capability_detector", "Intent"),
+    "detect_capability_gap": ("capability_detector", "detect_capability_gap"),
+    "ToolGenerator": ("tool_generator", "ToolGenerator"),
+    "create_tool_from_gap": ("tool_generator", "create_tool_from_gap"),
+    "ToolValidator": ("tool_validator", "ToolValidator"),
+    "ValidationResult": ("tool_validator", "ValidationResult"),
+    "validate_tool": ("tool_validator", "validate_tool"),
+    "DynamicToolOrchestrator": ("orchestrator", "DynamicToolOrchestrator"),
+    "CreationLog": ("orchestrator", "CreationLog"),
+    "get_orchestrator": ("orchestrator", "get_orchestrator"),
+    "create_tool_on_demand": ("orchestrator", "create_tool_on_demand"),
+}
+
+
+def __getattr__(name: str):
+    """Import a main component on first access and cache it on the module."""
+    if name in _LAZY:
+        module_name, attr = _LAZY[name]
+        value = getattr(importlib.import_module(f".{module_name}", __name__), attr)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
 # Public API
 __all__ = [
@@ -99,6 +102,7 @@ __all__ = [
     "FileWatcher",
     "CapabilityDetector",
     "CapabilityGap",
+    "CompiledDetector",
     "Intent",
     "ToolGenerator",
     "ToolValidator",
@@ -120,31 +124,37 @@ __all__ = [
 # Convenience shortcuts
 def load_tool(tool_name: str, version: str = None) -> bool:
     """Load a tool. Shortcut for get_loader().load_tool()."""
+    from .tool_loader import get_loader
     return get_loader().load_tool(tool_name, version)
 
 
 def unload_tool(tool_name: str) -> bool:
     """Unload a tool. Shortcut for get_loader().unload_tool()."""
+    from .tool_loader import get_loader
     return get_loader().unload_tool(tool_name)
 
 
 def reload_tool(tool_name: str) -> bool:
     """Reload a tool. Shortcut for get_loader().reload_tool()."""
+    from .tool_loader import get_loader
     return get_loader().reload_tool(tool_name)
 
 
 def list_available_tools() -> list:
     """List available tools. Shortcut for get_loader().list_available_tools()."""
+    from .tool_loader import get_loader
     return get_loader().list_available_tools()
 
 
 def list_loaded_tools() -> list:
     """List loaded tools. Shortcut for get_loader().list_loaded_tools()."""
+    from .tool_loader import get_loader
     return get_loader().list_loaded_tools()
 
 
 def is_tool_loaded(tool_name: str) -> bool:
     """Check if tool is loaded. Shortcut for get_loader().is_tool_loaded()."""
+    from .tool_loader import get_loader
     return get_loader().is_tool_loaded(tool_name)
 
 
@@ -8,26 +8,92 @@ characterizes the type of gap for tool generation.
 
 import os
 import json
-from pathlib import Path
-from typing import Dict, List, Tuple
+import functools
+import itertools
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 from datetime import datetime
 import re
 
 
+# Intent patterns (domain -> keywords)
+INTENT_PATTERNS = {
+    "document-processing": ["pdf", "document", "text", "extract", "parse"],
+    "email-automation": ["email", "send", "mail", "message"],
+    "data-transformation": ["transform", "convert", "format", "restructure", "csv", "json"],
+    "web-scraping": ["scrape", "crawl", "website", "fetch", "download"],
+    "system-monitoring": ["monitor", "health", "status", "watch", "check"],
+    "task-automation": ["automate", "schedule", "task", "cron", "recurring"],
+    "reporting": ["report", "analyze", "summary", "statistics", "aggregate"],
+    "integration": ["connect", "integrate", "sync", "combine", "orchestrate"],
+    "file-handling": ["file", "directory", "upload", "download", "storage"],
+    "image-processing": ["image", "photo", "picture", "visual", "qr", "barcode"],
+}
+
+
+# Words too common to be useful as skill keywords
+_COMMON_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'is', 'are', 'to', 'for', 'with'})
+
+
+def _compile_keywords(keywords: List[str]) -> "re.Pattern":
+    """Compile keywords into one substring alternation (longest first)."""
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, ordered)))
+
+
+# All intent keywords in one scan. The lookahead reports a match at every
+# position, so overlapping keywords (e.g. "mail" inside "email") are all
+# seen, matching the per-keyword `kw in text` checks this replaces.
+# (Keywords that are prefixes of one another would only count once.)
+_INTENT_SCAN = re.compile(
+    "(?=(" + _compile_keywords(
+        [kw for kws in INTENT_PATTERNS.values() for kw in kws]
+    ).pattern + "))"
+)
+
+# Sparse keyword -> intent incidence: each keyword maps to the row indices
+# of the intents it votes for, so scoring touches only keywords that hit
+_INTENT_NAMES: Tuple[str, ...] = tuple(INTENT_PATTERNS)
+_KEYWORD_INTENTS: Dict[str, Tuple[int, ...]] = {}
+for _row, _keywords in enumerate(INTENT_PATTERNS.values()):
+    for _kw in _keywords:
+        _KEYWORD_INTENTS[_kw] = _KEYWORD_INTENTS.get(_kw, ()) + (_row,)
+
+# Gap classification indicators
+_COMPLEXITY_WORDS_RE = _compile_keywords(["advanced", "complex", "custom", "special"])
+_FORMAT_WORDS_RE = _compile_keywords(["json", "csv", "xml", "yaml", "markdown"])
+_WORKFLOW_WORDS_RE = _compile_keywords(["workflow", "pipeline", "schedule", "daily", "weekly"])
+
+# Complexity indicators: (pattern, points added)
+_COMPLEXITY_FACTORS = [
+    (_compile_keywords(["api", "service", "external", "integration", "http", "request"]), 2.5),
+    (_compile_keywords(["file", "upload", "download", "storage", "directory"]), 1.5),
+    (_compile_keywords(["parse", "transform", "convert", "process", "analyze", "aggregate"]), 2.5),
+    (_compile_keywords(["schedule", "recurring", "daily", "weekly", "batch", "watch"]), 2.0),
+    (_compile_keywords(["ai", "machine learning", "nlp", "predict", "classify"]), 3.0),
+]
+
+
 class CapabilityGapDetector:
     """
     Analyzes user requests against available tools and detects capability gaps.
     """
     
-    def __init__(self, skills_path: str = "skills"):
+    def __init__(self, skills_path: str = "skills", index_cache_path: Optional[str] = None):
         """
         Initialize detector with path to skills directory.
         
         Args:
             skills_path: Path to skills directory
+            index_cache_path: Optional JSON file (e.g. ~/.cache/skills_index.json)
+                              persisting parsed SKILL.md metadata across runs;
+                              files whose mtime is unchanged are not re-parsed
         """
         self.skills_path = skills_path
+        self.index_cache_path = (
+            os.path.expanduser(index_cache_path) if index_cache_path else None
+        )
         self.available_skills = self._load_available_skills()
+        self._build_keyword_index()
     
     def _load_available_skills(self) -> Dict[str, Dict]:
         """
@@ -38,90 +104,165 @@ class CapabilityGapDetector:
         """
         skills = {}
         
-        if not Path(self.skills_path).exists():
+        if not os.path.isdir(self.skills_path):
             return skills
         
-        for skill_dir in Path(self.skills_path).iterdir():
-            if not skill_dir.is_dir():
-                continue
-            
-            skill_md = skill_dir / "SKILL.md"
-            if skill_md.exists():
-                skill_name = skill_dir.name
+        index = self._read_index_cache()
+        fresh_index = {}
+        
+        # DirEntry caches the file type from the directory read, so only
+        # SKILL.md itself needs a stat call
+        with os.scandir(self.skills_path) as entries:
+            for skill_dir in entries:
+                if not skill_dir.is_dir():
+                    continue
                 
-                # Extract description from frontmatter
-                description = self._extract_description(skill_md)
+                path = os.path.join(skill_dir.path, "SKILL.md")
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
                 
-                # Extract capabilities from SKILL.md
-                capabilities = self._extract_capabilities(skill_md)
+                # Reuse persisted metadata when the file hasn't changed
+                entry = index.get(path)
+                if entry and entry[0] == mtime:
+                    description, capabilities = entry[1], tuple(entry[2])
+                else:
+                    description, capabilities = self._parse_skill_md(path, mtime)
+                fresh_index[path] = [mtime, description, list(capabilities)]
                 
-                skills[skill_name] = {
-                    "path": str(skill_dir),
+                skills[skill_dir.name] = {
+                    "path": skill_dir.path,
                     "description": description,
-                    "capabilities": capabilities,
-                    "keywords": self._extract_keywords(description, capabilities)
+                    "capabilities": list(capabilities),
+                    "keywords": self._extract_keywords(description, list(capabilities))
                 }
         
+        if fresh_index != index:
+            self._write_index_cache(fresh_index)
+        
         return skills
     
-    def _extract_description(self, skill_md_path: Path) -> str:
-        """Extract description from SKILL.md frontmatter."""
+    def _read_index_cache(self) -> Dict[str, list]:
+        """Load the persisted {path: [mtime, description, capabilities]} index."""
+        if not self.index_cache_path:
+            return {}
         try:
-            with open(skill_md_path, 'r') as f:
-                content = f.read()
-                
-                # Extract description from YAML frontmatter
-                match = re.search(r'description:\s*(.+?)(?:\n|$)', content)
-                if match:
-                    return match.group(1).strip('"').strip("'")
-                
-                return ""
-        except:
-            return ""
+            with open(self.index_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
     
-    def _extract_capabilities(self, skill_md_path: Path) -> List[str]:
-        """Extract capability descriptions from SKILL.md."""
-        capabilities = []
+    def _write_index_cache(self, index: Dict[str, list]) -> None:
+        """Persist the parsed skill index (best effort)."""
+        if not self.index_cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.index_cache_path) or ".", exist_ok=True)
+            with open(self.index_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+        except OSError:
+            pass
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _parse_skill_md(path: str, mtime: float) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Read and parse a SKILL.md once.
         
+        Memoized on (path, mtime), so repeated detector instances in one
+        process only re-parse files that changed.
+        
+        Returns:
+            (description, capabilities)
+        """
         try:
-            with open(skill_md_path, 'r') as f:
+            with open(path, 'r', encoding='utf-8') as f:
                 content = f.read()
-                
-                # Extract capabilities section
-                if "## Core Capabilities" in content:
-                    cap_start = content.find("## Core Capabilities") + len("## Core Capabilities")
-                    cap_end = content.find("##", cap_start)
-                    cap_section = content[cap_start:cap_end]
-                    
-                    # Extract bullet points
-                    lines = cap_section.split('\n')
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith('-'):
-                            capabilities.append(line[1:].strip())
-                
-                return capabilities[:10]  # Limit to first 10
-        except:
-            return []
-    
-    def _extract_keywords(self, description: str, capabilities: List[str]) -> List[str]:
-        """Extract searchable keywords from description and capabilities."""
-        keywords = []
+        except (OSError, UnicodeDecodeError):
+            return "", ()
         
-        # Extract from description
-        words = description.lower().split()
-        keywords.extend(words[:10])
+        description, capabilities = CapabilityGapDetector._parse_skill_content(content)
+        return description, tuple(capabilities)
+    
+    def _build_keyword_index(self) -> None:
+        """Precompute keyword -> skills postings and per-skill keyword sets."""
+        self._keyword_index: Dict[str, Set[str]] = {}
+        self._skill_kw: Dict[str, FrozenSet[str]] = {}
+        self._skill_order: Dict[str, int] = {}
+        
+        for order, (skill_name, skill_info) in enumerate(self.available_skills.items()):
+            keywords = frozenset(skill_info['keywords'])
+            self._skill_kw[skill_name] = keywords
+            self._skill_order[skill_name] = order
+            for keyword in keywords:
+                self._keyword_index.setdefault(keyword, set()).add(skill_name)
+    
+    @staticmethod
+    def _parse_skill_content(content: str) -> Tuple[str, List[str]]:
+        """
+        Single pass over SKILL.md lines.
         
-        # Extract from capabilities
-        for cap in capabilities:
-            words = cap.lower().split()
-            keywords.extend(words[:5])
+        Takes the description from the `---` frontmatter block (or the first
+        `description:` line if there is no frontmatter) and collects bullets
+        from the first Core Capabilities section. Fenced code blocks are
+        skipped.
         
-        # Remove common words
-        common = {'the', 'a', 'an', 'and', 'or', 'is', 'are', 'to', 'for', 'with'}
-        keywords = [w for w in keywords if w not in common and len(w) > 2]
+        Returns:
+            (description, capabilities) - capabilities limited to first 10
+        """
+        description = None
+        capabilities = []
+        lines = content.splitlines()
+        body_start = 0
+        
+        # Frontmatter: between the first two `---` lines
+        if lines and lines[0].strip() == "---":
+            for i in range(1, len(lines)):
+                line = lines[i].strip()
+                if line == "---":
+                    body_start = i + 1
+                    break
+                if description is None and line.startswith("description:"):
+                    description = line[len("description:"):].strip()
+            else:
+                body_start = 0  # Unterminated block: treat it all as body
+        
+        in_fence = False
+        in_capabilities = False
+        for line in lines[body_start:]:
+            stripped = line.strip()
+            if stripped.startswith("```"):
+                # Closing fences carry no info string (CommonMark)
+                in_fence = not in_fence or stripped.strip("`") != ""
+                continue
+            if in_fence:
+                continue  # Example SKILL.md snippets inside code blocks
+            if stripped.startswith("##"):
+                if in_capabilities:
+                    break  # Only the first Core Capabilities section counts
+                in_capabilities = "## Core Capabilities" in stripped
+            elif in_capabilities and stripped.startswith("-"):
+                capabilities.append(stripped[1:].strip())
+            elif description is None and stripped.startswith("description:"):
+                description = stripped[len("description:"):].strip()
+        
+        description = (description or "").strip('"').strip("'")
+        return description, capabilities[:10]
+    
+    def _extract_keywords(self, description: str, capabilities: List[str]) -> List[str]:
+        """Extract searchable keywords from description and capabilities."""
+        # Ordered dedup keeps the result (and the index built from it) stable
+        seen: Dict[str, None] = {}
+        sources = itertools.chain(
+            [(description, 10)], ((cap, 5) for cap in capabilities)
+        )
+        for text, limit in sources:
+            for word in text.lower().split()[:limit]:
+                if len(word) > 2 and word not in _COMMON_WORDS:
+                    seen.setdefault(word, None)
         
-        return list(set(keywords))[:20]
+        return list(seen)[:20]
     
     def detect_gap(self, user_request: str, threshold: float = 0.5) -> Dict:
         """
@@ -135,8 +276,11 @@ class CapabilityGapDetector:
             Dict with gap detection results
         """
         
+        # Lowercase once; every helper below scans the same text
+        request_lower = user_request.lower()
+        
         # Step 1: Extract intent from request
-        intent = self._extract_intent(user_request)
+        intent = self._extract_intent(request_lower)
         
         # Step 2: Find matching tools
         matches = self._find_matching_skills(intent)
@@ -151,7 +295,7 @@ class CapabilityGapDetector:
         
         # Step 4: Characterize the gap
         if gap_detected:
-            gap_type = self._classify_gap(user_request, intent, matches)
+            gap_type = self._classify_gap(request_lower, intent, matches)
         else:
             gap_type = None
         
@@ -161,49 +305,33 @@ class CapabilityGapDetector:
             "best_match": best_match,
             "close_matches": matches[:3],
             "gap_type": gap_type,
-            "missing_capability": self._describe_gap(user_request, intent, matches),
-            "complexity_score": self._estimate_complexity(user_request, intent),
+            "missing_capability": self._describe_gap(request_lower, intent, matches),
+            "complexity_score": self._estimate_complexity(request_lower, intent),
             "suggested_skill_name": self._suggest_skill_name(intent),
             "confidence": best_match['match_score'] if best_match else 0.0,
             "timestamp": datetime.now().isoformat()
         }
     
-    def _extract_intent(self, request: str) -> str:
+    def _extract_intent(self, request_lower: str) -> str:
         """
-        Extract core intent from user request.
+        Extract core intent from lowercased user request.
         
         Examples:
-            "Read PDF files" → "document-reading"
-            "Send me emails" → "email-automation"
-            "Monitor system health" → "system-monitoring"
+            "read pdf files" → "document-reading"
+            "send me emails" → "email-automation"
+            "monitor system health" → "system-monitoring"
         """
-        request_lower = request.lower()
-        
-        # Intent patterns (domain -> keywords)
-        intent_patterns = {
-            "document-processing": ["pdf", "document", "text", "extract", "parse"],
-            "email-automation": ["email", "send", "mail", "message"],
-            "data-transformation": ["transform", "convert", "format", "restructure", "csv", "json"],
-            "web-scraping": ["scrape", "crawl", "website", "fetch", "download"],
-            "system-monitoring": ["monitor", "health", "status", "watch", "check"],
-            "task-automation": ["automate", "schedule", "task", "cron", "recurring"],
-            "reporting": ["report", "analyze", "summary", "statistics", "aggregate"],
-            "integration": ["connect", "integrate", "sync", "combine", "orchestrate"],
-            "file-handling": ["file", "directory", "upload", "download", "storage"],
-            "image-processing": ["image", "photo", "picture", "visual", "qr", "barcode"],
-        }
-        
-        # Find best matching intent
-        best_intent = "generic-tool"
-        best_count = 0
-        
-        for intent, keywords in intent_patterns.items():
-            count = sum(1 for kw in keywords if kw in request_lower)
-            if count > best_count:
-                best_count = count
-                best_intent = intent
-        
-        return best_intent
+        # Count distinct keywords per intent from a single scan
+        counts = [0] * len(_INTENT_NAMES)
+        for keyword in set(_INTENT_SCAN.findall(request_lower)):
+            for row in _KEYWORD_INTENTS[keyword]:
+                counts[row] += 1
+        
+        # Best matching intent (first intent wins ties)
+        best_row = max(range(len(counts)), key=counts.__getitem__)
+        if counts[best_row] == 0:
+            return "generic-tool"
+        return _INTENT_NAMES[best_row]
     
     def _find_matching_skills(self, intent: str) -> List[Dict]:
         """
@@ -212,32 +340,36 @@ class CapabilityGapDetector:
         Returns:
             List of matching skills with match scores, sorted by relevance
         """
-        matches = []
+        request_keywords = set(intent.split('-'))
+        
+        # Only skills sharing at least one keyword can score above zero
+        candidates = set()
+        for keyword in request_keywords:
+            candidates |= self._keyword_index.get(keyword, set())
         
-        for skill_name, skill_info in self.available_skills.items():
-            # Calculate match score based on keywords
-            request_keywords = set(intent.split('-'))
-            skill_keywords = set(skill_info['keywords'])
+        matches = []
+        for skill_name in sorted(candidates, key=self._skill_order.__getitem__):
+            skill_info = self.available_skills[skill_name]
+            skill_keywords = self._skill_kw[skill_name]
             
             # Jaccard similarity
             intersection = len(request_keywords & skill_keywords)
             union = len(request_keywords | skill_keywords)
-            match_score = intersection / union if union > 0 else 0
+            match_score = intersection / union
             
-            if match_score > 0:
-                matches.append({
-                    "skill_name": skill_name,
-                    "description": skill_info['description'],
-                    "match_score": match_score,
-                    "capabilities": skill_info['capabilities']
-                })
+            matches.append({
+                "skill_name": skill_name,
+                "description": skill_info['description'],
+                "match_score": match_score,
+                "capabilities": skill_info['capabilities']
+            })
         
         # Sort by match score
         matches.sort(key=lambda x: x['match_score'], reverse=True)
         
         return matches
     
-    def _classify_gap(self, request: str, intent: str, matches: List[Dict]) -> str:
+    def _classify_gap(self, request_lower: str, intent: str, matches: List[Dict]) -> str:
         """
         Classify the type of capability gap.
         
@@ -249,8 +381,6 @@ class CapabilityGapDetector:
         - workflow-gap: Multi-step workflow across existing tools
         """
         
-        request_lower = request.lower()
-        
         # No matches at all = domain gap
         if not matches:
             return "domain-gap"
@@ -260,7 +390,7 @@ class CapabilityGapDetector:
         
         # Close match but request asks for more = complexity gap
         if 0.5 < match_score < 0.8:
-            if any(word in request_lower for word in ["advanced", "complex", "custom", "special"]):
+            if _COMPLEXITY_WORDS_RE.search(request_lower):
                 return "complexity-gap"
         
         # Multiple tool names mentioned = integration gap
@@ -268,18 +398,18 @@ class CapabilityGapDetector:
             return "integration-gap"
         
         # Asking for specific format = format gap
-        if any(fmt in request_lower for fmt in ["json", "csv", "xml", "yaml", "markdown"]):
+        if _FORMAT_WORDS_RE.search(request_lower):
             if match_score > 0.3:
                 return "format-gap"
         
         # Multi-step or scheduled = workflow gap
-        if any(word in request_lower for word in ["workflow", "pipeline", "schedule", "daily", "weekly"]):
+        if _WORKFLOW_WORDS_RE.search(request_lower):
             return "workflow-gap"
         
         # Default: domain gap for low matches
         return "domain-gap"
     
-    def _describe_gap(self, request: str, intent: str, matches: List[Dict]) -> str:
+    def _describe_gap(self, request_lower: str, intent: str, matches: List[Dict]) -> str:
         """Generate human-readable description of the capability gap."""
         
         if not matches or matches[0]['match_score'] < 0.5:
@@ -288,7 +418,7 @@ class CapabilityGapDetector:
         best_match = matches[0]
         return f"Need enhancement to '{best_match['skill_name']}' skill for: {intent.replace('-', ' ')}"
     
-    def _estimate_complexity(self, request: str, intent: str) -> float:
+    def _estimate_complexity(self, request_lower: str, intent: str) -> float:
         """
         Estimate complexity of building a tool for this request (1-10 scale).
         
@@ -301,28 +431,11 @@ class CapabilityGapDetector:
         """
         
         complexity = 2.0  # Base
-        request_lower = request.lower()
         
         # Check for complexity indicators
-        api_keywords = ["api", "service", "external", "integration", "http", "request"]
-        if any(kw in request_lower for kw in api_keywords):
-            complexity += 2.5
-        
-        file_keywords = ["file", "upload", "download", "storage", "directory"]
-        if any(kw in request_lower for kw in file_keywords):
-            complexity += 1.5
-        
-        data_keywords = ["parse", "transform", "convert", "process", "analyze", "aggregate"]
-        if any(kw in request_lower for kw in data_keywords):
-            complexity += 2.5
-        
-        async_keywords = ["schedule", "recurring", "daily", "weekly", "batch", "watch"]
-        if any(kw in request_lower for kw in async_keywords):
-            complexity += 2.0
-        
-        ml_keywords = ["ai", "machine learning", "nlp", "predict", "classify"]
-        if any(kw in request_lower for kw in ml_keywords):
-            complexity += 3.0
+        for pattern, points in _COMPLEXITY_FACTORS:
+            if pattern.search(request_lower):
+                complexity += points
         
         # Cap at 10
         return min(complexity, 10.0)
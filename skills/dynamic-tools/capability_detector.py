@@ -3,8 +3,75 @@ Capability Gap Detection - Detect when user requests exceed current tools
 """
 
 from typing import Dict, List, Optional, Any
+from collections import OrderedDict
 from datetime import datetime
+import bisect
+import copy
+import functools
+import heapq
+import math
+import operator
 import re
+import time
+
+# Optional imports (graceful degradation)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+# detect_gap reports "no gap" once a tool scores above this
+_PERFECT_MATCH_SCORE = 0.85
+
+# Gap confidence by best match score: below 0.2, below 0.5, otherwise
+_CONFIDENCE_THRESHOLDS = (0.2, 0.5)
+_CONFIDENCE_LEVELS = (0.9, 0.7, 0.5)
+
+# Gap classification by best match score band:
+#   0: no match or < 0.3, 1: [0.3, 0.5), 2: exactly 0.5, 3: > 0.5
+_GAP_SCORE_BANDS = (0.3, 0.5, math.nextafter(0.5, math.inf))
+_GAP_TYPE_BY_BAND = {
+    (0, False): "domain-gap",
+    (0, True): "domain-gap",
+    (1, False): "format-gap",
+    (1, True): "integration-gap",  # Several entities, weak match
+    (2, False): "format-gap",
+    (2, True): "format-gap",
+    (3, False): "complexity-gap",
+    (3, True): "complexity-gap",
+}
+_GAP_DESCRIPTIONS = {
+    "domain-gap": lambda intent, matches: f"No existing tool handles {intent.category} operations",
+    "integration-gap": lambda intent, matches: f"Need to combine {', '.join(intent.entities)} handling",
+    "complexity-gap": lambda intent, matches: (
+        f"Existing {matches[0]['name']} tool insufficient for advanced {intent.action} operations"
+    ),
+    "format-gap": lambda intent, matches: (
+        f"Need different format handling for {intent.entities[0] if intent.entities else intent.category}"
+    ),
+}
+
+# Tool-name cleanup: spaces become dashes
+_NAME_TRANS = str.maketrans({" ": "-"})
+
+# Below this many tools the NumPy setup costs more than the Python loop
+_VECTORIZE_MIN_TOOLS = 16
+
+_match_score = operator.itemgetter("match_score")
+
+# Compiled once at import and shared by every detector
+_WORD_RE = re.compile(r'\b\w+\b')
+_ASCII_NON_WORD_RE = re.compile(r'[^a-z0-9_]+')  # \W for lowercased ASCII text
+_UPPER_RE = re.compile(r'\b([A-Z]{2,})\b')  # Acronyms, e.g. "API", "AWS"
+_CAMEL_RE = re.compile(r'\b([A-Z][a-z]+(?:[A-Z][a-z]+)+)\b')  # e.g. "GitHub"
 
 
 class CapabilityGap:
@@ -12,13 +79,18 @@ class CapabilityGap:
     
     GAP_TYPES = ["domain-gap", "integration-gap", "complexity-gap", "format-gap", "workflow-gap"]
     
+    __slots__ = (
+        "gap_type", "description", "suggested_tool_name", "requirements",
+        "complexity_score", "detected_at", "confidence",
+    )
+    
     def __init__(self, gap_type: str, description: str, tool_name: str, requirements: dict, complexity: float):
         self.gap_type = gap_type
         self.description = description
         self.suggested_tool_name = tool_name
         self.requirements = requirements
         self.complexity_score = complexity
-        self.detected_at = datetime.now().isoformat()
+        self.detected_at = time.time()  # Formatted only when serialized
         self.confidence = 0.0
     
     def to_dict(self) -> dict:
@@ -31,13 +103,15 @@ class CapabilityGap:
             "tool_requirements": self.requirements,
             "complexity_score": self.complexity_score,
             "confidence": self.confidence,
-            "detected_at": self.detected_at
+            "detected_at": datetime.fromtimestamp(self.detected_at).isoformat()
         }
 
 
 class Intent:
     """Represents extracted user intent."""
     
+    __slots__ = ("category", "action", "entities", "keywords")
+    
     def __init__(self, category: str, action: str, entities: List[str], keywords: List[str]):
         self.category = category  # e.g., "data-transform", "monitoring", "automation"
         self.action = action  # e.g., "read", "parse", "convert", "monitor"
@@ -75,70 +149,142 @@ class CapabilityDetector:
     # File format keywords
     FILE_FORMATS = ["pdf", "csv", "json", "xml", "yaml", "excel", "docx", "txt", "md"]
     
-    def __init__(self, available_tools: List[str] = None):
+    # Action verbs, in priority order
+    ACTION_VERBS = ["read", "write", "convert", "parse", "send", "fetch", "monitor", "run", "create", "delete"]
+    
+    def __init__(self, available_tools: List[str] = None, cache_size: int = 512):
         self.available_tools = available_tools or []
+        # LRU of detect_gap results keyed on (request, tools); 0 disables it
+        self.cache_size = cache_size
+        self._gap_cache: OrderedDict = OrderedDict()
     
     def extract_intent(self, request: str) -> Intent:
         """
         Extract intent from user request.
         
+        Intent depends only on the request text, so parsing is memoized
+        per detector class. Each call gets its own Intent, so mutating it
+        (or its lists) never reaches the cache.
+        
         Args:
             request: User request text
         
         Returns:
             Intent object
         """
+        cached = _cached_intent(type(self), request)
+        return Intent(
+            cached.category, cached.action, list(cached.entities), list(cached.keywords)
+        )
+    
+    @classmethod
+    def _parse_intent(cls, request: str) -> Intent:
+        """Uncached intent extraction behind extract_intent."""
         request_lower = request.lower()
         
-        # Extract keywords
-        keywords = [word for word in re.findall(r'\b\w+\b', request_lower) if len(word) > 3]
-        
-        # Detect domain category
-        category_scores = {}
-        for category, domain_keywords in self.DOMAIN_KEYWORDS.items():
-            score = sum(1 for kw in domain_keywords if kw in request_lower)
-            if score > 0:
-                category_scores[category] = score
-        
-        category = max(category_scores.items(), key=lambda x: x[1])[0] if category_scores else "general"
+        # Extract keywords (splitting skips the per-position \b checks; same
+        # words as _WORD_RE for ASCII text)
+        if request_lower.isascii():
+            words = _ASCII_NON_WORD_RE.split(request_lower)
+        else:
+            words = _WORD_RE.findall(request_lower)
+        keywords = [word for word in words if len(word) > 3]
+        
+        # One pass over the vocabulary hits scores categories, picks the
+        # highest-priority action verb and collects file formats together
+        vocabulary = _vocabulary(cls)
+        category_scores = [0] * len(cls.DOMAIN_KEYWORDS)
+        action_rank = len(cls.ACTION_VERBS)
+        format_ranks = []
+        for kw in cls._scan_keywords(request_lower):
+            category_rows, verb_rank, format_rank = vocabulary[kw]
+            for row in category_rows:
+                category_scores[row] += 1
+            if verb_rank is not None and verb_rank < action_rank:
+                action_rank = verb_rank
+            if format_rank is not None:
+                format_ranks.append(format_rank)
+        
+        # Detect domain category (first category wins ties)
+        best_score = max(category_scores)
+        category = _category_names(cls)[category_scores.index(best_score)] if best_score else "general"
         
         # Detect action verbs
-        action_verbs = ["read", "write", "convert", "parse", "send", "fetch", "monitor", "run", "create", "delete"]
-        action = next((verb for verb in action_verbs if verb in request_lower), "process")
+        action = cls.ACTION_VERBS[action_rank] if action_rank < len(cls.ACTION_VERBS) else "process"
         
         # Detect entities (file formats, technologies)
-        entities = []
-        for fmt in self.FILE_FORMATS:
-            if fmt in request_lower:
-                entities.append(fmt.upper())
+        entities: set = {cls.FILE_FORMATS[rank].upper() for rank in sorted(format_ranks)}
         
-        # Look for tech names
-        tech_patterns = [r'\b([A-Z]{2,})\b', r'\b([A-Z][a-z]+(?:[A-Z][a-z]+)+)\b']
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, request)
-            entities.extend(matches)
+        # Look for tech names (both patterns need an uppercase letter, so
+        # already-lowercase requests can skip them)
+        if request != request_lower:
+            for pattern in (_UPPER_RE, _CAMEL_RE):
+                for match in pattern.finditer(request):
+                    entities.add(match.group(1))
         
-        return Intent(category, action, list(set(entities)), keywords)
+        return Intent(category, action, list(entities), keywords)
     
-    def find_matching_tools(self, intent: Intent, available_tools: List[str]) -> List[dict]:
+    @classmethod
+    def _scan_keywords(cls, request_lower: str) -> set:
+        """
+        Return the vocabulary keywords that occur (as substrings) in the text.
+        
+        Uses one Aho-Corasick pass when pyahocorasick is installed, otherwise
+        a `kw in text` check per keyword.
+        """
+        if HAS_AHOCORASICK:
+            return {kw for _, kw in _keyword_automaton(cls).iter(request_lower)}
+        return {kw for kw in _vocabulary(cls) if kw in request_lower}
+    
+    def find_matching_tools(
+        self,
+        intent: Intent,
+        available_tools: List[str],
+        early_exit_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> List[dict]:
         """
         Find tools that match the intent.
         
         Args:
             intent: Extracted intent
             available_tools: List of available tool names
+            early_exit_threshold: If set and some tool scores above it, return
+                just the best-scoring tool (the top of the full ranking), and
+                stop scanning at the first maximal score (None = full ranking)
+            top_k: If set, return only the k best matches, selected with a
+                heap instead of sorting every match (None = all matches)
         
         Returns:
             List of matching tools with scores
         """
+        # Lowercased names are cached per tool list, so repeated calls over a
+        # stable tool set don't redo them
+        tools = tuple(available_tools)
+        if HAS_NUMPY and len(tools) >= _VECTORIZE_MIN_TOOLS:
+            return self._find_matching_tools_vectorized(
+                intent, tools, _lowered_tool_array(tools), early_exit_threshold, top_k
+            )
+        return self._score_tools(
+            intent, tools, _lowered_tool_names(tools), early_exit_threshold, top_k
+        )
+    
+    def _score_tools(
+        self,
+        intent: Intent,
+        tools: tuple,
+        tools_lower: tuple,
+        early_exit_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> List[dict]:
+        """Scalar scoring loop behind find_matching_tools."""
         matches = []
+        best = None
+        entities_lower = [entity.lower() for entity in intent.entities]
         
-        for tool_name in available_tools:
+        for tool_name, tool_lower in zip(tools, tools_lower):
             score = 0.0
             
-            # Check if tool name contains intent keywords
-            tool_lower = tool_name.lower()
-            
             # Match category
             if intent.category in tool_lower:
                 score += 0.3
@@ -148,8 +294,8 @@ class CapabilityDetector:
                 score += 0.3
             
             # Match entities
-            for entity in intent.entities:
-                if entity.lower() in tool_lower:
+            for entity in entities_lower:
+                if entity in tool_lower:
                     score += 0.2
             
             # Match keywords
@@ -157,13 +303,59 @@ class CapabilityDetector:
                 if keyword in tool_lower:
                     score += 0.05
             
+            if early_exit_threshold is not None and score > early_exit_threshold:
+                # Same pick as the vectorized argmax: highest clipped score,
+                # ties to the earlier tool; nothing can beat a full 1.0
+                if best is None or min(score, 1.0) > best["match_score"]:
+                    best = {"name": tool_name, "match_score": min(score, 1.0)}
+                    if score >= 1.0:
+                        break
+            
             if score > 0:
                 matches.append({
                     "name": tool_name,
                     "match_score": min(score, 1.0)
                 })
         
-        return sorted(matches, key=lambda x: x["match_score"], reverse=True)
+        if best is not None:
+            return [best]
+        return _rank(matches, top_k)
+    
+    def _find_matching_tools_vectorized(
+        self,
+        intent: Intent,
+        tools: tuple,
+        tools_lower,
+        early_exit_threshold: Optional[float] = None,
+        top_k: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        find_matching_tools with each substring check run over all tools at once.
+        
+        Weights are added in the same order as the scalar loop, so scores
+        are bit-for-bit identical.
+        """
+        scores = np.zeros(len(tools_lower))
+        
+        tokens = [(intent.category, 0.3), (intent.action, 0.3)]
+        tokens += [(entity.lower(), 0.2) for entity in intent.entities]
+        tokens += [(keyword, 0.05) for keyword in intent.keywords]
+        for token, weight in tokens:
+            scores += (np.char.find(tools_lower, token) >= 0) * weight
+        
+        if early_exit_threshold is not None:
+            # Every score is already computed, so return the best tool above
+            # the threshold, not the first (argmax ties go to tool order)
+            clipped = np.minimum(scores, 1.0)
+            i = int(clipped.argmax())
+            if scores[i] > early_exit_threshold:
+                return [{"name": tools[i], "match_score": float(clipped[i])}]
+        
+        matches = [
+            {"name": tools[i], "match_score": min(float(scores[i]), 1.0)}
+            for i in np.flatnonzero(scores > 0)
+        ]
+        return _rank(matches, top_k)
     
     def detect_gap(self, request: str, available_tools: List[str] = None) -> Dict[str, Any]:
         """
@@ -179,14 +371,38 @@ class CapabilityDetector:
         if available_tools is None:
             available_tools = self.available_tools
         
+        # Repeated requests against the same tools are a dict lookup
+        key = (request, tuple(available_tools))
+        result = _lru_get(self._gap_cache, key)
+        if result is not None:
+            return result
+        
         # Extract intent
         intent = self.extract_intent(request)
         
         # Find matching tools
-        matches = self.find_matching_tools(intent, available_tools)
+        # Any tool above the perfect-match score settles it; stop scanning there
+        # Only the best match feeds the result, so skip ranking the rest
+        matches = self.find_matching_tools(
+            intent, available_tools, early_exit_threshold=_PERFECT_MATCH_SCORE, top_k=1
+        )
         
+        result = self._gap_result(intent, matches)
+        return _lru_put(self._gap_cache, key, result, self.cache_size)
+    
+    @classmethod
+    def compile(cls, available_tools: List[str]) -> "CompiledDetector":
+        """
+        Detector specialized to a fixed tool list, for tight loops.
+        
+        Compiled detectors are cached per (class, tool list).
+        """
+        return _compiled_detector(cls, tuple(available_tools))
+    
+    def _gap_result(self, intent: Intent, matches: List[dict]) -> Dict[str, Any]:
+        """Turn an intent and its ranked matches into a detect_gap result."""
         # Check if perfect match exists
-        if matches and matches[0]["match_score"] > 0.85:
+        if matches and matches[0]["match_score"] > _PERFECT_MATCH_SCORE:
             return {
                 "gap_detected": False,
                 "reason": f"Matching tool exists: {matches[0]['name']}",
@@ -209,19 +425,10 @@ class CapabilityDetector:
         Returns:
             CapabilityGap object
         """
-        # Determine gap type
-        if not matches or matches[0]["match_score"] < 0.3:
-            gap_type = "domain-gap"
-            description = f"No existing tool handles {intent.category} operations"
-        elif len(intent.entities) > 1 and matches[0]["match_score"] < 0.5:
-            gap_type = "integration-gap"
-            description = f"Need to combine {', '.join(intent.entities)} handling"
-        elif matches and matches[0]["match_score"] > 0.5:
-            gap_type = "complexity-gap"
-            description = f"Existing {matches[0]['name']} tool insufficient for advanced {intent.action} operations"
-        else:
-            gap_type = "format-gap"
-            description = f"Need different format handling for {intent.entities[0] if intent.entities else intent.category}"
+        # Determine gap type: one table lookup on (score band, multi-entity)
+        band = bisect.bisect_right(_GAP_SCORE_BANDS, matches[0]["match_score"]) if matches else 0
+        gap_type = _GAP_TYPE_BY_BAND[band, len(intent.entities) > 1]
+        description = _GAP_DESCRIPTIONS[gap_type](intent, matches)
         
         # Generate suggested tool name
         tool_name = self._generate_tool_name(intent)
@@ -253,23 +460,25 @@ class CapabilityDetector:
         else:
             name = f"{intent.category}-{intent.action}er"
         
-        # Clean up
-        name = name.replace("__", "-").replace(" ", "-")
+        # Clean up (spaces in one translate pass; "__" is rare, so check first)
+        name = name.translate(_NAME_TRANS)
+        if "__" in name:
+            name = name.replace("__", "-")
         
         return name
     
     def _derive_requirements(self, intent: Intent, gap_type: str) -> dict:
         """Derive tool requirements from intent."""
-        # Generate function names
-        core_functions = [
-            f"{intent.action}_{entity.lower()}" for entity in intent.entities
-        ] if intent.entities else [
-            f"{intent.action}_data",
-            f"process_{intent.category}"
-        ]
+        action = intent.action
+        entities = intent.entities
         
-        # Limit to 3-5 functions
-        core_functions = core_functions[:5]
+        # Generate function names (limit to 3-5, slicing before formatting)
+        if entities:
+            core_functions = [f"{action}_{entity.lower()}" for entity in entities[:5]]
+            success_criteria = [f"Successfully {action}s {entity}" for entity in entities[:2]]
+        else:
+            core_functions = [f"{action}_data", f"process_{intent.category}"]
+            success_criteria = [f"Handles {intent.category} operations correctly"]
         
         # Add common functions
         if gap_type != "format-gap":
@@ -279,12 +488,8 @@ class CapabilityDetector:
             "core_functions": core_functions,
             "input_format": "dict",
             "output_format": "dict",
-            "dependencies": intent.entities[:3],  # Limit dependencies
-            "success_criteria": [
-                f"Successfully {intent.action}s {entity}" for entity in intent.entities[:2]
-            ] if intent.entities else [
-                f"Handles {intent.category} operations correctly"
-            ]
+            "dependencies": entities[:3],  # Limit dependencies
+            "success_criteria": success_criteria
         }
         
         return requirements
@@ -336,14 +541,148 @@ class CapabilityDetector:
         if not matches:
             return 0.95  # High confidence - no matches at all
         
-        best_score = matches[0]["match_score"]
-        
-        if best_score < 0.2:
-            return 0.9  # High confidence
-        elif best_score < 0.5:
-            return 0.7  # Medium confidence
+        # Best score < 0.2: high, < 0.5: medium, otherwise low (close match exists)
+        return _CONFIDENCE_LEVELS[bisect.bisect_right(_CONFIDENCE_THRESHOLDS, matches[0]["match_score"])]
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_intent(cls, request: str) -> Intent:
+    """Memoized cls._parse_intent; intent depends only on the request text."""
+    return cls._parse_intent(request)
+
+
+@functools.lru_cache(maxsize=32)
+def _lowered_tool_names(tools: tuple) -> tuple:
+    """Lowercased tool names, computed once per tool list."""
+    return tuple(tool.lower() for tool in tools)
+
+
+@functools.lru_cache(maxsize=32)
+def _lowered_tool_array(tools: tuple):
+    """Lowercased tool names as a NumPy string array, built once per tool list."""
+    return np.array(_lowered_tool_names(tools), dtype=str)
+
+
+@functools.lru_cache(maxsize=None)
+def _category_names(cls) -> tuple:
+    """DOMAIN_KEYWORDS categories of cls, indexed by row."""
+    return tuple(cls.DOMAIN_KEYWORDS)
+
+
+@functools.lru_cache(maxsize=None)
+def _vocabulary(cls) -> Dict[str, tuple]:
+    """
+    Every keyword scanned for by cls, mapped to what a hit contributes:
+    (DOMAIN_KEYWORDS rows it scores, ACTION_VERBS rank, FILE_FORMATS rank).
+    """
+    categories: Dict[str, tuple] = {}
+    for row, domain_keywords in enumerate(cls.DOMAIN_KEYWORDS.values()):
+        for kw in domain_keywords:
+            categories[kw] = categories.get(kw, ()) + (row,)
+    verb_ranks = {verb: rank for rank, verb in reversed(list(enumerate(cls.ACTION_VERBS)))}
+    format_ranks = {fmt: rank for rank, fmt in reversed(list(enumerate(cls.FILE_FORMATS)))}
+    return {
+        kw: (categories.get(kw, ()), verb_ranks.get(kw), format_ranks.get(kw))
+        for kw in {**categories, **verb_ranks, **format_ranks}
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _keyword_automaton(cls):
+    """Aho-Corasick automaton over cls's vocabulary, built once per class."""
+    automaton = ahocorasick.Automaton()
+    for kw in _vocabulary(cls):
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return automaton
+
+
+# Build the default detector's inverted index up front rather than on the
+# first request
+_category_names(CapabilityDetector)
+_vocabulary(CapabilityDetector)
+if HAS_AHOCORASICK:
+    _keyword_automaton(CapabilityDetector)
+
+
+class CompiledDetector:
+    """
+    CapabilityDetector frozen to one tool list (see CapabilityDetector.compile).
+    
+    Lowercased tool names (and the NumPy array, for large lists) are built
+    once, and results are cached by request text alone, so repeated calls
+    skip all per-call tool-list work.
+    """
+    
+    __slots__ = ("detector", "tools", "cache_size", "_tools_lower", "_tools_array", "_gap_cache")
+    
+    def __init__(self, detector: CapabilityDetector, tools: tuple):
+        self.detector = detector
+        self.tools = tools
+        self.cache_size = detector.cache_size
+        self._tools_lower = _lowered_tool_names(tools)
+        self._tools_array = (
+            _lowered_tool_array(tools)
+            if HAS_NUMPY and len(tools) >= _VECTORIZE_MIN_TOOLS
+            else None
+        )
+        self._gap_cache: OrderedDict = OrderedDict()
+    
+    def detect_gap(self, request: str) -> Dict[str, Any]:
+        """Detect capability gap for a request against the compiled tools."""
+        result = _lru_get(self._gap_cache, request)
+        if result is not None:
+            return result
+        
+        detector = self.detector
+        intent = detector.extract_intent(request)
+        if self._tools_array is not None:
+            matches = detector._find_matching_tools_vectorized(
+                intent, self.tools, self._tools_array, _PERFECT_MATCH_SCORE, 1
+            )
         else:
-            return 0.5  # Low confidence (close match exists)
+            matches = detector._score_tools(
+                intent, self.tools, self._tools_lower, _PERFECT_MATCH_SCORE, 1
+            )
+        
+        result = detector._gap_result(intent, matches)
+        return _lru_put(self._gap_cache, request, result, self.cache_size)
+
+
+def _rank(matches: List[dict], top_k: Optional[int]) -> List[dict]:
+    """Matches by descending score, ties in tool order, cut to top_k."""
+    if top_k is None:
+        return sorted(matches, key=_match_score, reverse=True)
+    # nlargest is documented equal to sorted(...)[:k], tie order included
+    return heapq.nlargest(top_k, matches, key=_match_score)
+
+
+def _lru_get(cache: OrderedDict, key) -> Optional[Dict[str, Any]]:
+    """Deep copy of a cached detect_gap result (detected_at refreshed), or None."""
+    result = cache.get(key)
+    if result is None:
+        return None
+    cache.move_to_end(key)
+    # Deep: tool_requirements / best_match are nested and callers may mutate them
+    result = copy.deepcopy(result)
+    if "detected_at" in result:
+        result["detected_at"] = datetime.now().isoformat()
+    return result
+
+
+def _lru_put(cache: OrderedDict, key, result: Dict[str, Any], size: int) -> Dict[str, Any]:
+    """Remember a detect_gap result, evicting the oldest; returns it uncached."""
+    if size > 0:
+        cache[key] = copy.deepcopy(result)
+        if len(cache) > size:
+            cache.popitem(last=False)
+    return result
+
+
+@functools.lru_cache(maxsize=32)
+def _compiled_detector(cls, tools: tuple) -> CompiledDetector:
+    """Shared CompiledDetector per (detector class, tool list)."""
+    return CompiledDetector(cls(list(tools)), tools)
 
 
 # Convenience function
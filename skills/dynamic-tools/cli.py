@@ -14,6 +14,8 @@ Usage:
     python cli.py validate <tool-name>  # Validate a tool
     python cli.py watch                 # Start hot-reload watcher
     python cli.py stats                 # Show statistics
+
+    Add --json to info or stats for machine-readable output.
 """
 
 import sys
@@ -21,6 +23,13 @@ import json
 from pathlib import Path
 import io
 
+# Optional imports (graceful degradation)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Fix Windows console encoding for emojis
 if sys.stdout.encoding != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -28,33 +37,51 @@ if sys.stdout.encoding != 'utf-8':
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from tool_loader import get_loader
-from tool_watcher import get_watcher
-from capability_detector import detect_capability_gap
-from orchestrator import get_orchestrator, create_tool_on_demand
-from tool_validator import validate_tool
+# Command modules are imported inside each handler, so a command only
+# pays for the modules it uses
+
+
+def _write(lines):
+    """Write a command's report in one call instead of one print per line."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _write_json(data):
+    """Write data as indented JSON (orjson straight to the byte stream if available)."""
+    if HAS_ORJSON:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        sys.stdout.write(json.dumps(data, indent=2, default=str) + "\n")
 
 
 def cmd_list():
     """List available and loaded tools."""
+    from tool_loader import get_loader
+    
+    out = []
     loader = get_loader()
     
     available = loader.list_available_tools()
     loaded = loader.list_loaded_tools()
     
-    print("📦 Available Tools:")
+    out.append("📦 Available Tools:")
     if available:
         for tool in available:
             status = "✅ loaded" if tool in loaded else "⭕ not loaded"
-            print(f"  - {tool} ({status})")
+            out.append(f"  - {tool} ({status})")
     else:
-        print("  (none)")
+        out.append("  (none)")
     
-    print(f"\n📊 Summary: {len(available)} available, {len(loaded)} loaded")
+    out.append(f"\n📊 Summary: {len(available)} available, {len(loaded)} loaded")
+    _write(out)
 
 
 def cmd_load(tool_name):
     """Load a tool."""
+    from tool_loader import get_loader
+    
     loader = get_loader()
     
     print(f"⏳ Loading tool: {tool_name}")
@@ -75,6 +102,8 @@ def cmd_load(tool_name):
 
 def cmd_unload(tool_name):
     """Unload a tool."""
+    from tool_loader import get_loader
+    
     loader = get_loader()
     
     print(f"⏳ Unloading tool: {tool_name}")
@@ -92,6 +121,8 @@ def cmd_unload(tool_name):
 
 def cmd_reload(tool_name):
     """Reload a tool."""
+    from tool_loader import get_loader
+    
     loader = get_loader()
     
     print(f"⏳ Reloading tool: {tool_name}")
@@ -107,60 +138,76 @@ def cmd_reload(tool_name):
     return 0
 
 
-def cmd_info(tool_name):
+def cmd_info(tool_name, as_json=False):
     """Get tool information."""
+    from tool_loader import get_loader
+    
+    out = []
     loader = get_loader()
     
     info = loader.get_tool_info(tool_name)
     
+    if as_json:
+        _write_json(info)
+        return 0 if info else 1
+    
     if info:
-        print(f"ℹ️  Tool Information: {tool_name}")
-        print(f"   Name: {info['name']}")
-        print(f"   Version: {info['version']}")
-        print(f"   Status: {info['status']}")
-        print(f"   Loaded at: {info['loaded_at']}")
-        print(f"   Path: {info['path']}")
-        print(f"   Has implementation: {info['has_implementation']}")
+        out.append(f"ℹ️  Tool Information: {tool_name}")
+        out.append(f"   Name: {info['name']}")
+        out.append(f"   Version: {info['version']}")
+        out.append(f"   Status: {info['status']}")
+        out.append(f"   Loaded at: {info['loaded_at']}")
+        out.append(f"   Path: {info['path']}")
+        out.append(f"   Has implementation: {info['has_implementation']}")
         
         if info.get('error'):
-            print(f"   Error: {info['error']}")
+            out.append(f"   Error: {info['error']}")
     else:
-        print(f"❌ Tool not found or not loaded: {tool_name}")
+        out.append(f"❌ Tool not found or not loaded: {tool_name}")
+        _write(out)
         return 1
     
+    _write(out)
     return 0
 
 
 def cmd_detect(request):
     """Detect capability gap."""
+    from tool_loader import get_loader
+    from capability_detector import CapabilityDetector
+    
+    out = []
     loader = get_loader()
     available = loader.list_available_tools()
     
-    print(f"🔍 Analyzing request: \"{request}\"")
-    print(f"   Available tools: {len(available)}")
+    out.append(f"🔍 Analyzing request: \"{request}\"")
+    out.append(f"   Available tools: {len(available)}")
     
-    gap = detect_capability_gap(request, available)
+    gap = CapabilityDetector.compile(available).detect_gap(request)
     
     if gap["gap_detected"]:
-        print(f"\n⚠️  Capability gap detected!")
-        print(f"   Type: {gap['gap_type']}")
-        print(f"   Description: {gap['missing_capability']}")
-        print(f"   Suggested tool: {gap['suggested_skill_name']}")
-        print(f"   Complexity: {gap['complexity_score']}/10")
-        print(f"   Confidence: {gap['confidence']:.1%}")
+        out.append(f"\n⚠️  Capability gap detected!")
+        out.append(f"   Type: {gap['gap_type']}")
+        out.append(f"   Description: {gap['missing_capability']}")
+        out.append(f"   Suggested tool: {gap['suggested_skill_name']}")
+        out.append(f"   Complexity: {gap['complexity_score']}/10")
+        out.append(f"   Confidence: {gap['confidence']:.1%}")
         
-        print(f"\n💡 Suggested functions:")
+        out.append(f"\n💡 Suggested functions:")
         for func in gap['tool_requirements'].get('core_functions', [])[:5]:
-            print(f"   - {func}")
+            out.append(f"   - {func}")
     else:
-        print(f"\n✅ No gap detected")
-        print(f"   Reason: {gap.get('reason', 'Existing tools sufficient')}")
+        out.append(f"\n✅ No gap detected")
+        out.append(f"   Reason: {gap.get('reason', 'Existing tools sufficient')}")
     
+    _write(out)
     return 0
 
 
 def cmd_create(request):
     """Create tool on-demand."""
+    from orchestrator import create_tool_on_demand
+    
     print(f"🛠️  Creating tool for request: \"{request}\"")
     
     result = create_tool_on_demand(request, auto_approve=False)
@@ -178,16 +225,19 @@ def cmd_create(request):
 
 def cmd_validate(tool_name):
     """Validate a tool."""
+    from tool_validator import validate_tool
+    
     print(f"✔️  Validating tool: {tool_name}")
     
     results = validate_tool(tool_name)
     
-    print(f"\n📋 Validation Results:")
-    print(f"   Overall: {'✅ PASSED' if results['all_passed'] else '❌ FAILED'}")
+    out = []
+    out.append(f"\n📋 Validation Results:")
+    out.append(f"   Overall: {'✅ PASSED' if results['all_passed'] else '❌ FAILED'}")
     
     for check_name, check_result in results["validations"].items():
         status = "✅" if check_result["passed"] else "❌"
-        print(f"   {status} {check_name}")
+        out.append(f"   {status} {check_name}")
         
         # Show details for failed checks
         if not check_result["passed"]:
@@ -195,15 +245,18 @@ def cmd_validate(tool_name):
             if isinstance(details, dict):
                 for key, value in details.items():
                     if not value:
-                        print(f"      - {key}: {value}")
+                        out.append(f"      - {key}: {value}")
             elif details:
-                print(f"      - {details}")
+                out.append(f"      - {details}")
     
+    _write(out)
     return 0 if results["all_passed"] else 1
 
 
 def cmd_watch():
     """Start hot-reload watcher."""
+    from tool_watcher import get_watcher
+    
     print("👁️  Starting hot-reload watcher...")
     print("   Press Ctrl+C to stop")
     
@@ -232,41 +285,53 @@ def cmd_watch():
         return 0
 
 
-def cmd_stats():
+def cmd_stats(as_json=False):
     """Show statistics."""
-    orchestrator = get_orchestrator()
+    from orchestrator import get_orchestrator
     
-    print("📊 Dynamic Tools Statistics")
-    print("=" * 50)
+    out = []
+    orchestrator = get_orchestrator()
     
     # State
     state = orchestrator.export_state()
-    print(f"\n🔧 System State:")
-    print(f"   Available tools: {len(state['available_tools'])}")
-    print(f"   Loaded tools: {len(state['loaded_tools'])}")
-    print(f"   Watched tools: {len(state['watched_tools'])}")
+    
+    if as_json:
+        _write_json({
+            "state": state,
+            "stats": state["statistics"],
+            "recent": orchestrator.list_created_tools()[-5:],
+        })
+        return 0
+    
+    out.append("📊 Dynamic Tools Statistics")
+    out.append("=" * 50)
+    out.append(f"\n🔧 System State:")
+    out.append(f"   Available tools: {len(state['available_tools'])}")
+    out.append(f"   Loaded tools: {len(state['loaded_tools'])}")
+    out.append(f"   Watched tools: {len(state['watched_tools'])}")
     
     # Statistics
     stats = orchestrator.get_statistics()
-    print(f"\n📈 Creation Statistics:")
-    print(f"   Average complexity: {stats.get('average_complexity', 0):.1f}/10")
-    print(f"   Validation pass rate: {stats.get('validation_pass_rate', 0):.1%}")
-    print(f"   Hot-reload success rate: {stats.get('hotreload_success_rate', 0):.1%}")
+    out.append(f"\n📈 Creation Statistics:")
+    out.append(f"   Average complexity: {stats.get('average_complexity', 0):.1f}/10")
+    out.append(f"   Validation pass rate: {stats.get('validation_pass_rate', 0):.1%}")
+    out.append(f"   Hot-reload success rate: {stats.get('hotreload_success_rate', 0):.1%}")
     
     gap_types = stats.get('by_gap_type', {})
     if gap_types:
-        print(f"\n🔍 Gap Types:")
+        out.append(f"\n🔍 Gap Types:")
         for gap_type, count in gap_types.items():
-            print(f"   - {gap_type}: {count}")
+            out.append(f"   - {gap_type}: {count}")
     
     # Recent tools
     tools = orchestrator.list_created_tools()
     if tools:
-        print(f"\n🆕 Recent Tools (last 5):")
+        out.append(f"\n🆕 Recent Tools (last 5):")
         for tool in tools[-5:]:
-            print(f"   - {tool['name']} (v{tool.get('version', '?')})")
-            print(f"     Created: {tool.get('created_at', 'unknown')[:19]}")
+            out.append(f"   - {tool['name']} (v{tool.get('version', '?')})")
+            out.append(f"     Created: {tool.get('created_at', 'unknown')[:19]}")
     
+    _write(out)
     return 0
 
 
@@ -281,6 +346,13 @@ def main():
         print_usage()
         return 1
     
+    as_json = "--json" in sys.argv
+    if as_json:
+        sys.argv = [arg for arg in sys.argv if arg != "--json"]
+        if len(sys.argv) < 2:
+            print_usage()
+            return 1
+    
     command = sys.argv[1].lower()
     
     try:
@@ -309,7 +381,7 @@ def main():
             if len(sys.argv) < 3:
                 print("❌ Usage: cli.py info <tool-name>")
                 return 1
-            return cmd_info(sys.argv[2])
+            return cmd_info(sys.argv[2], as_json)
         
         elif command == "detect":
             if len(sys.argv) < 3:
@@ -335,7 +407,7 @@ def main():
             return cmd_watch()
         
         elif command == "stats":
-            return cmd_stats()
+            return cmd_stats(as_json)
         
         else:
             print(f"❌ Unknown command: {command}")
@@ -4,20 +4,12 @@ Examples demonstrating dynamic-tools functionality
 This file contains practical examples of using the dynamic-tools skill.
 """
 
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from dynamic_tools import (
-    get_loader,
-    get_watcher,
-    detect_capability_gap,
-    create_tool_on_demand,
-    validate_tool,
-    get_orchestrator
-)
+# Run as a script (python examples.py); the skill's modules import as siblings
+from tool_loader import get_loader
+from tool_watcher import get_watcher
+from capability_detector import detect_capability_gap
+from tool_validator import validate_tool
+from orchestrator import create_tool_on_demand, get_orchestrator
 
 
 def example_1_basic_tool_loading():
@@ -2,39 +2,99 @@
 Dynamic Tool Orchestrator - Main controller for on-demand tool creation
 """
 
-import time
+import importlib
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
+from functools import cached_property
 import json
 
+# Optional imports (graceful degradation)
 try:
-    from .capability_detector import CapabilityDetector, detect_capability_gap
-    from .tool_generator import ToolGenerator, create_tool_from_gap
-    from .tool_validator import ToolValidator, validate_tool
-    from .tool_loader import ToolLoader, get_loader
-    from .tool_watcher import ToolWatcher, get_watcher
+    import orjson
+    HAS_ORJSON = True
 except ImportError:
-    from capability_detector import CapabilityDetector, detect_capability_gap
-    from tool_generator import ToolGenerator, create_tool_from_gap
-    from tool_validator import ToolValidator, validate_tool
-    from tool_loader import ToolLoader, get_loader
-    from tool_watcher import ToolWatcher, get_watcher
+    HAS_ORJSON = False
+
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+
+# Below this size json.load beats setting up an incremental parser
+_STREAM_MIN_BYTES = 64 * 1024
+
+
+def _sibling(module_name: str):
+    """Import a sibling module on first use, as a package or as scripts."""
+    if __package__:
+        return importlib.import_module(f".{module_name}", __package__)
+    return importlib.import_module(module_name)
 
 
 class CreationLog:
-    """Manages tool-creation-log.json."""
+    """
+    Manages tool-creation-log.json.
+    
+    New entries are appended to a JSONL journal next to the log file
+    (tool-creation-log.jsonl) and folded into the JSON snapshot by
+    compact(), which runs once the journal has grown as large as the
+    snapshot, keeping per-entry writes amortized O(1).
+    """
     
     def __init__(self, log_file: str = "tool-creation-log.json"):
         self.log_file = Path(log_file)
+        self.journal_file = self.log_file.with_suffix(".jsonl")
+        self._journaled = 0
+        self._journal_skipped = 0
+        self._journal_needs_newline = False
         self.log_data = self._load_log()
+        self._rebuild_statistics()
+        
+        if self._journaled:
+            self._update_statistics()
     
     def _load_log(self) -> dict:
-        """Load existing log or create new one."""
+        """Load existing log or create new one, replaying the journal."""
+        log_data = self._load_snapshot()
+        tools = log_data["tools"]
+        known_ids = {tool.get("id") for tool in tools}
+        
+        for entry in self._iter_journal():
+            if entry.get("id") not in known_ids:
+                tools.append(entry)
+                self._journaled += 1
+        
+        if self._journaled:
+            log_data["total_tools_created"] = len(tools)
+        
+        # Unreadable journal lines may be entries whose ids were handed out;
+        # count them so those ids are never reused
+        self._last_id = max(
+            [len(tools) + self._journal_skipped]
+            + [self._id_number(tool.get("id")) for tool in tools]
+        )
+        
+        return log_data
+    
+    @staticmethod
+    def _id_number(tool_id) -> int:
+        """Numeric part of a "tool_NNN" id (0 if it has none)."""
+        try:
+            return int(str(tool_id).rsplit("_", 1)[-1])
+        except ValueError:
+            return 0
+    
+    def _load_snapshot(self) -> dict:
+        """Load the JSON snapshot or create a new one."""
         if self.log_file.exists():
             try:
-                with open(self.log_file, 'r') as f:
-                    return json.load(f)
+                with open(self.log_file, 'rb') as f:
+                    data = f.read()
+                return orjson.loads(data) if HAS_ORJSON else json.loads(data)
             except Exception:
                 pass
         
@@ -52,6 +112,31 @@ class CreationLog:
             }
         }
     
+    def _iter_journal(self):
+        """
+        Yield entries appended since the last compaction.
+        
+        Lines that don't parse (torn by an interrupted write) are counted
+        and skipped; every valid line after them is still replayed.
+        """
+        if not self.journal_file.exists():
+            return
+        
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                # The next append must not run on from a torn final line
+                self._journal_needs_newline = not line.endswith(b"\n")
+                if not line.strip():
+                    continue
+                try:
+                    entry = orjson.loads(line) if HAS_ORJSON else json.loads(line)
+                except ValueError:
+                    entry = None
+                if isinstance(entry, dict):
+                    yield entry
+                else:
+                    self._journal_skipped += 1
+    
     def add_entry(self, tool_info: dict) -> str:
         """
         Add tool creation entry.
@@ -62,7 +147,8 @@ class CreationLog:
         Returns:
             Tool ID
         """
-        tool_id = f"tool_{len(self.log_data['tools']) + 1:03d}"
+        self._last_id += 1
+        tool_id = f"tool_{self._last_id:03d}"
         
         entry = {
             "id": tool_id,
@@ -74,52 +160,121 @@ class CreationLog:
         self.log_data["total_tools_created"] = len(self.log_data["tools"])
         
         # Update statistics
+        self._count_entry(entry)
         self._update_statistics()
         
-        # Save to file
-        self._save_log()
+        # Journal the entry; fold it into the snapshot once the journal
+        # is as large as the snapshot itself
+        self._append_journal(entry)
+        
+        if self._journaled * 2 >= len(self.log_data["tools"]):
+            self.compact()
         
         return tool_id
     
+    def _rebuild_statistics(self):
+        """Recompute the running aggregates with one pass over the tools list."""
+        self._gap_counts = {}
+        self._complexity_sum = 0
+        self._validation_pass = 0
+        self._hotreload_pass = 0
+        
+        for tool in self.log_data["tools"]:
+            self._count_entry(tool)
+    
+    def _count_entry(self, tool: dict):
+        """Fold a single tool entry into the running aggregates."""
+        gap_type = tool.get("capability_gap_type", "unknown")
+        self._gap_counts[gap_type] = self._gap_counts.get(gap_type, 0) + 1
+        self._complexity_sum += tool.get("complexity_score", 0)
+        self._validation_pass += tool.get("validation_passed", False)
+        self._hotreload_pass += tool.get("hotreload_success", False)
+    
     def _update_statistics(self):
-        """Update statistics from tools list."""
-        tools = self.log_data["tools"]
+        """Write statistics derived from the running aggregates."""
+        total = len(self.log_data["tools"])
         
-        if not tools:
+        if not total:
             return
         
-        # Count by gap type
-        gap_counts = {}
-        for tool in tools:
-            gap_type = tool.get("capability_gap_type", "unknown")
-            gap_counts[gap_type] = gap_counts.get(gap_type, 0) + 1
-        
-        self.log_data["statistics"]["by_gap_type"] = gap_counts
-        
-        # Average complexity
-        complexities = [t.get("complexity_score", 0) for t in tools]
-        self.log_data["statistics"]["average_complexity"] = sum(complexities) / len(complexities) if complexities else 0.0
-        
-        # Validation pass rate
-        validations = [t.get("validation_passed", False) for t in tools]
-        self.log_data["statistics"]["validation_pass_rate"] = sum(validations) / len(validations) if validations else 0.0
+        stats = self.log_data["statistics"]
+        stats["by_gap_type"] = dict(self._gap_counts)
+        stats["average_complexity"] = self._complexity_sum / total
+        stats["validation_pass_rate"] = self._validation_pass / total
+        stats["hotreload_success_rate"] = self._hotreload_pass / total
+    
+    def _append_journal(self, entry: dict):
+        """Append a single entry to the JSONL journal."""
+        if HAS_ORJSON:
+            line = orjson.dumps(entry) + b"\n"
+        else:
+            line = (json.dumps(entry, separators=(',', ':')) + "\n").encode("utf-8")
+        if self._journal_needs_newline:
+            line = b"\n" + line
         
-        # Hotreload success rate
-        hotreloads = [t.get("hotreload_success", False) for t in tools]
-        self.log_data["statistics"]["hotreload_success_rate"] = sum(hotreloads) / len(hotreloads) if hotreloads else 0.0
+        try:
+            with open(self.journal_file, 'ab') as f:
+                f.write(line)
+            self._journaled += 1
+            self._journal_needs_newline = False
+        except Exception as e:
+            # A partial write may have left a torn line behind
+            self._journal_needs_newline = True
+            print(f"Error appending to log journal: {e}")
     
-    def _save_log(self):
+    def _save_log(self) -> bool:
         """Save log to file."""
+        # Tools go last so read_stats can stop streaming at "statistics"
+        snapshot = {k: v for k, v in self.log_data.items() if k != "tools"}
+        snapshot["tools"] = self.log_data["tools"]
+        
         try:
-            with open(self.log_file, 'w') as f:
-                json.dump(self.log_data, f, indent=2)
+            if HAS_ORJSON:
+                with open(self.log_file, 'wb') as f:
+                    f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.log_file, 'w') as f:
+                    json.dump(snapshot, f, indent=2)
+            return True
         except Exception as e:
             print(f"Error saving log: {e}")
+            return False
+    
+    def compact(self):
+        """Rewrite the JSON snapshot with every entry and clear the journal."""
+        if self._save_log():
+            self.journal_file.unlink(missing_ok=True)
+            self._journaled = 0
+            self._journal_skipped = 0
+            self._journal_needs_newline = False
     
     def get_stats(self) -> dict:
         """Get statistics."""
         return self.log_data["statistics"]
     
+    @classmethod
+    def read_stats(cls, log_file: str = "tool-creation-log.json") -> dict:
+        """
+        Read statistics without materializing the tools list.
+        
+        Equivalent to CreationLog(log_file).get_stats(). Large snapshots are
+        stream-parsed for just the "statistics" object when ijson is
+        installed; a pending journal means the statistics must be
+        recomputed, so that case does a full load.
+        """
+        log_path = Path(log_file)
+        
+        if HAS_IJSON and not log_path.with_suffix(".jsonl").exists():
+            try:
+                if log_path.stat().st_size >= _STREAM_MIN_BYTES:
+                    with open(log_path, 'rb') as f:
+                        for stats in ijson.items(f, 'statistics', use_float=True):
+                            return stats
+            except Exception:
+                pass
+        
+        return cls(log_file).get_stats()
+    
     def get_tools(self) -> list:
         """Get all tool entries."""
         return self.log_data["tools"]
@@ -139,12 +294,40 @@ class DynamicToolOrchestrator:
     
     def __init__(self, skills_dir: str = "skills", log_file: str = "tool-creation-log.json"):
         self.skills_dir = Path(skills_dir)
-        self.detector = CapabilityDetector()
-        self.generator = ToolGenerator(str(skills_dir))
-        self.validator = ToolValidator(str(skills_dir))
-        self.loader = get_loader()
-        self.watcher = get_watcher()
-        self.log = CreationLog(log_file)
+        self._log_file = log_file
+    
+    # Components are built on first use, so callers that only read the
+    # log don't pay for the detector tables or a skills directory scan
+    
+    @cached_property
+    def detector(self):
+        """Capability gap detector."""
+        return _sibling("capability_detector").CapabilityDetector()
+    
+    @cached_property
+    def generator(self):
+        """Tool generator writing into skills_dir."""
+        return _sibling("tool_generator").ToolGenerator(str(self.skills_dir))
+    
+    @cached_property
+    def validator(self):
+        """Tool validator reading from skills_dir."""
+        return _sibling("tool_validator").ToolValidator(str(self.skills_dir))
+    
+    @cached_property
+    def loader(self):
+        """Shared tool loader."""
+        return _sibling("tool_loader").get_loader()
+    
+    @cached_property
+    def watcher(self):
+        """Shared tool watcher."""
+        return _sibling("tool_watcher").get_watcher()
+    
+    @cached_property
+    def log(self) -> CreationLog:
+        """Tool creation log."""
+        return CreationLog(self._log_file)
     
     def create_tool_on_demand(self, user_request: str, auto_approve: bool = False) -> Dict[str, Any]:
         """
@@ -169,8 +352,10 @@ class DynamicToolOrchestrator:
         # Step 1: Detect capability gap
         print("🔍 Analyzing capability gap...")
         
+        # Compiled detectors are shared per tool list, so repeated requests
+        # against an unchanged skills dir hit the same exact-match cache
         available_tools = self.loader.list_available_tools()
-        gap = self.detector.detect_gap(user_request, available_tools)
+        gap = self.detector.compile(available_tools).detect_gap(user_request)
         
         result["steps"]["gap_detection"] = gap
         
@@ -236,14 +421,9 @@ class DynamicToolOrchestrator:
         # Step 5: Hot-reload
         print("🔄 Loading tool...")
         
-        # Wait for watcher to detect (or load manually)
-        load_success = False
-        for attempt in range(5):
-            time.sleep(1)
-            
-            if self.loader.load_tool(gap['suggested_skill_name']):
-                load_success = True
-                break
+        # The generated files already exist, so load directly; only fall
+        # back to waiting on the watcher if discovery hasn't caught up
+        load_success = self._load_new_tool(gap['suggested_skill_name'])
         
         result["steps"]["hotreload"] = {"success": load_success}
         
@@ -277,8 +457,35 @@ class DynamicToolOrchestrator:
         
         return result
     
+    def _load_new_tool(self, tool_name: str, timeout: float = 5.0) -> bool:
+        """
+        Load a freshly generated tool.
+        
+        Tries immediately; if the tool isn't discoverable yet, waits up to
+        `timeout` seconds for the watcher's tool_added event and retries once.
+        """
+        added = threading.Event()
+        
+        def on_added(name, details):
+            if name == tool_name:
+                added.set()
+        
+        # Subscribe before the first attempt so an event that lands in
+        # between isn't missed
+        self.watcher.on("tool_added", on_added)
+        try:
+            if self.loader.load_tool(tool_name):
+                return True
+            
+            return added.wait(timeout) and self.loader.load_tool(tool_name)
+        finally:
+            self.watcher.off("tool_added", on_added)
+    
     def get_statistics(self) -> dict:
         """Get creation statistics."""
+        # Stats-only callers don't need the tools list loaded
+        if "log" not in self.__dict__:
+            return CreationLog.read_stats(self._log_file)
         return self.log.get_stats()
     
     def list_created_tools(self) -> list:
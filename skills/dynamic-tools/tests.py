@@ -2,7 +2,9 @@
 Comprehensive test suite for dynamic-tools skill
 """
 
+import os
 import unittest
+from unittest import mock
 import sys
 import tempfile
 import shutil
@@ -13,9 +15,13 @@ import time
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Scratch directories go on RAM-backed /dev/shm when available, so
+# fixture setup doesn't wait on disk
+TMP_ROOT = "/dev/shm" if os.access("/dev/shm", os.W_OK) else tempfile.gettempdir()
+
 from tool_loader import ToolLoader, ToolVersion
-from tool_watcher import ToolWatcher, FileWatcher
-from capability_detector import CapabilityDetector, Intent
+from tool_watcher import ToolWatcher, FileWatcher, HAS_WATCHDOG
+from capability_detector import CapabilityDetector, Intent, HAS_NUMPY
 from tool_generator import ToolGenerator
 from tool_validator import ToolValidator, ValidationResult
 from orchestrator import DynamicToolOrchestrator, CreationLog
@@ -24,18 +30,19 @@ from orchestrator import DynamicToolOrchestrator, CreationLog
 class TestToolLoader(unittest.TestCase):
     """Test ToolLoader functionality."""
     
-    def setUp(self):
-        """Set up test environment."""
-        self.test_dir = tempfile.mkdtemp()
-        self.skills_dir = Path(self.test_dir) / "skills"
-        self.skills_dir.mkdir()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared, read-only test environment."""
+        cls.test_dir = tempfile.mkdtemp(dir=TMP_ROOT)
+        cls.skills_dir = Path(cls.test_dir) / "skills"
+        cls.skills_dir.mkdir()
         
         # Create a test tool
-        test_tool_dir = self.skills_dir / "test-tool"
+        test_tool_dir = cls.skills_dir / "test-tool"
         test_tool_dir.mkdir()
         
         # Write SKILL.md
-        skill_md = """---
+        skill_md = b"""---
 name: test-tool
 description: Test tool
 ---
@@ -45,7 +52,7 @@ description: Test tool
 ## Overview
 This is a test tool.
 """
-        (test_tool_dir / "SKILL.md").write_text(skill_md)
+        (test_tool_dir / "SKILL.md").write_bytes(skill_md)
         
         # Write metadata.json
         metadata = {
@@ -53,13 +60,16 @@ This is a test tool.
             "version": "1.0",
             "status": "active"
         }
-        (test_tool_dir / "metadata.json").write_text(json.dumps(metadata))
-        
-        self.loader = ToolLoader(str(self.skills_dir))
+        (test_tool_dir / "metadata.json").write_bytes(json.dumps(metadata).encode())
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test environment."""
-        shutil.rmtree(self.test_dir)
+        shutil.rmtree(cls.test_dir)
+    
+    def setUp(self):
+        """Fresh loader per test; loaded-tool state must not leak."""
+        self.loader = ToolLoader(str(self.skills_dir))
     
     def test_discover_tools(self):
         """Test tool discovery."""
@@ -117,21 +127,22 @@ This is a test tool.
         # Create another version
         test_tool_dir_v2 = self.skills_dir / "test-tool-v2"
         test_tool_dir_v2.mkdir()
+        self.addCleanup(shutil.rmtree, test_tool_dir_v2)
         
-        skill_md = """---
+        skill_md = b"""---
 name: test-tool-v2
 description: Test tool v2
 ---
 # Test Tool v2
 """
-        (test_tool_dir_v2 / "SKILL.md").write_text(skill_md)
+        (test_tool_dir_v2 / "SKILL.md").write_bytes(skill_md)
         
         metadata = {
             "skill_name": "test-tool-v2",
             "version": "2.0",
             "status": "active"
         }
-        (test_tool_dir_v2 / "metadata.json").write_text(json.dumps(metadata))
+        (test_tool_dir_v2 / "metadata.json").write_bytes(json.dumps(metadata).encode())
         
         # Load with fallback
         success = self.loader.load_with_fallback("test-tool")
@@ -143,7 +154,7 @@ class TestToolWatcher(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = tempfile.mkdtemp(dir=TMP_ROOT)
         self.skills_dir = Path(self.test_dir) / "skills"
         self.skills_dir.mkdir()
         
@@ -156,16 +167,18 @@ class TestToolWatcher(unittest.TestCase):
     def test_file_watcher_detects_changes(self):
         """Test FileWatcher detects file changes."""
         test_file = Path(self.test_dir) / "test.txt"
-        test_file.write_text("initial content")
+        test_file.write_bytes(b"initial content")
         
         watcher = FileWatcher(test_file)
         
         # No change initially
         self.assertFalse(watcher.has_changed())
         
-        # Modify file
-        time.sleep(0.1)  # Ensure timestamp changes
-        test_file.write_text("modified content")
+        # Modify file, bumping mtime explicitly rather than sleeping past
+        # the filesystem's timestamp granularity
+        test_file.write_bytes(b"modified content")
+        mtime = test_file.stat().st_mtime + 2
+        os.utime(test_file, (mtime, mtime))
         
         # Should detect change
         self.assertTrue(watcher.has_changed())
@@ -179,12 +192,12 @@ class TestToolWatcher(unittest.TestCase):
         new_tool_dir = self.skills_dir / "new-tool"
         new_tool_dir.mkdir()
         
-        skill_md = """---
+        skill_md = b"""---
 name: new-tool
 ---
 # New Tool
 """
-        (new_tool_dir / "SKILL.md").write_text(skill_md)
+        (new_tool_dir / "SKILL.md").write_bytes(skill_md)
         
         # Check for changes
         changes = self.watcher.check()
@@ -204,7 +217,7 @@ name: new-tool
         # Create new tool
         new_tool_dir = self.skills_dir / "callback-tool"
         new_tool_dir.mkdir()
-        (new_tool_dir / "SKILL.md").write_text("---\nname: callback-tool\n---\n# Test")
+        (new_tool_dir / "SKILL.md").write_bytes(b"---\nname: callback-tool\n---\n# Test")
         
         # Trigger scan
         self.watcher.check()
@@ -212,12 +225,94 @@ name: new-tool
         self.assertTrue(callback_called["value"])
 
 
+@unittest.skipUnless(HAS_WATCHDOG, "watchdog not installed")
+class TestToolWatcherEvents(unittest.TestCase):
+    """Test ToolWatcher's watchdog event backend."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp(dir=TMP_ROOT)
+        self.skills_dir = Path(self.test_dir) / "skills"
+        self.skills_dir.mkdir()
+        
+        self.watcher = ToolWatcher(str(self.skills_dir), backend="watchdog")
+        self.addCleanup(self.watcher.stop)
+    
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+    
+    def _check_until(self, predicate, timeout=2.0):
+        """Run check() until predicate(changes) holds; events arrive asynchronously."""
+        deadline = time.monotonic() + timeout
+        while True:
+            changes = self.watcher.check()
+            if predicate(changes) or time.monotonic() > deadline:
+                return changes
+            time.sleep(0.01)
+    
+    def test_uses_event_backend(self):
+        """Test the watchdog backend is active and idle checks are empty."""
+        self.assertEqual(self.watcher.export_state()["backend"], "watchdog")
+        self.assertEqual(self.watcher.check(), [])
+    
+    def test_events_detect_new_and_updated_tools(self):
+        """Test new tools and file updates arrive through events."""
+        added = []
+        self.watcher.on("tool_added", lambda name, details: added.append(name))
+        
+        tool_dir = self.skills_dir / "event-tool"
+        tool_dir.mkdir()
+        skill_md = tool_dir / "SKILL.md"
+        skill_md.write_bytes(b"---\nname: event-tool\n---\n# Event Tool")
+        
+        self._check_until(lambda changes: "event-tool" in added)
+        self.assertIn("event-tool", added)
+        
+        skill_md.write_bytes(b"---\nname: event-tool\n---\n# Event Tool v2")
+        mtime = skill_md.stat().st_mtime + 2
+        os.utime(skill_md, (mtime, mtime))
+        
+        changes = self._check_until(bool)
+        self.assertEqual([c["tool"] for c in changes], ["event-tool"])
+        self.assertEqual(changes[0]["file"], "SKILL.md")
+    
+    def test_many_tools(self):
+        """Test one recursive watch keeps checks cheap across many tools."""
+        self.watcher.stop()
+        for i in range(500):
+            tool_dir = self.skills_dir / f"tool-{i:03d}"
+            tool_dir.mkdir()
+            (tool_dir / "SKILL.md").write_bytes(b"# Tool %d" % i)
+        
+        self.watcher = ToolWatcher(str(self.skills_dir), backend="watchdog")
+        self.addCleanup(self.watcher.stop)
+        self.assertEqual(len(self.watcher.get_watched_tools()), 500)
+        
+        # Nothing queued: no per-tool stat or hash work
+        with mock.patch.object(
+            FileWatcher, "has_changed", autospec=True, side_effect=FileWatcher.has_changed
+        ) as has_changed:
+            self.assertEqual(self.watcher.check(), [])
+        has_changed.assert_not_called()
+        
+        # A change deep in one tool is still seen through the single watch
+        skill_md = self.skills_dir / "tool-250" / "SKILL.md"
+        skill_md.write_bytes(b"# Tool 250 v2")
+        mtime = skill_md.stat().st_mtime + 2
+        os.utime(skill_md, (mtime, mtime))
+        
+        changes = self._check_until(bool)
+        self.assertEqual([c["tool"] for c in changes], ["tool-250"])
+
+
 class TestCapabilityDetector(unittest.TestCase):
     """Test CapabilityDetector functionality."""
     
-    def setUp(self):
-        """Set up detector."""
-        self.detector = CapabilityDetector()
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared detector (tests never mutate it)."""
+        cls.detector = CapabilityDetector()
     
     def test_extract_intent_pdf(self):
         """Test intent extraction for PDF request."""
@@ -246,6 +341,20 @@ class TestCapabilityDetector(unittest.TestCase):
         self.assertTrue(len(matches) > 0)
         self.assertEqual(matches[0]["name"], "pdf-reader")
     
+    def test_find_matching_tools_early_exit(self):
+        """Test the early exit returns the best match above the threshold."""
+        available_tools = ["csv-parser", "pdf-reader", "pdf-file-reader", "pdf-file-reader-v2"]
+        
+        intent = Intent("file-handling", "read", ["PDF"], ["read", "file"])
+        matches = self.detector.find_matching_tools(
+            intent, available_tools, early_exit_threshold=0.5
+        )
+        ranked = self.detector.find_matching_tools(intent, available_tools)
+        
+        # pdf-reader is above the threshold first, but pdf-file-reader scores higher
+        self.assertEqual(matches, ranked[:1])
+        self.assertEqual(matches[0]["name"], "pdf-file-reader")
+    
     def test_detect_gap_no_match(self):
         """Test gap detection when no match exists."""
         request = "Can you read PDF files?"
@@ -268,6 +377,72 @@ class TestCapabilityDetector(unittest.TestCase):
             # If gap detected with good matches, confidence should be low
             self.assertLess(result.get("confidence", 1.0), 0.7)
     
+    def test_compiled_detector(self):
+        """Test compiled detector agrees with detect_gap."""
+        request = "Convert CSV files to JSON"
+        available_tools = ["csv-parser", "json-handler"]
+        
+        compiled = CapabilityDetector.compile(available_tools)
+        result = compiled.detect_gap(request)
+        expected = self.detector.detect_gap(request, available_tools)
+        
+        result.pop("detected_at", None)
+        expected.pop("detected_at", None)
+        self.assertEqual(result, expected)
+        self.assertIs(CapabilityDetector.compile(available_tools), compiled)
+
+    def test_detect_gap_picks_best_match(self):
+        """Test the scalar path reports the best tool, not the first above threshold."""
+        available_tools = [
+            "data-transform-convert-pdf-files",
+            "data-transform-convert-pdf-csv-files",
+        ]
+        
+        result = CapabilityDetector(available_tools).detect_gap("convert pdf files to csv")
+        
+        self.assertFalse(result["gap_detected"])
+        self.assertEqual(result["best_match"], {
+            "name": "data-transform-convert-pdf-csv-files",
+            "match_score": 1.0,
+        })
+    
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_vectorized_detect_gap_picks_best_match(self):
+        """Test the vectorized path reports the best tool, not the first above threshold."""
+        available_tools = [
+            "data-transform-convert-pdf-files",
+            "data-transform-convert-pdf-csv-files",
+        ] + [f"unrelated-tool-{i}" for i in range(20)]
+        
+        result = CapabilityDetector(available_tools).detect_gap("convert pdf files to csv")
+        
+        self.assertFalse(result["gap_detected"])
+        self.assertEqual(result["best_match"], {
+            "name": "data-transform-convert-pdf-csv-files",
+            "match_score": 1.0,
+        })
+    
+    def test_cached_results_are_isolated(self):
+        """Test mutating a cached intent or detect_gap result doesn't leak."""
+        for _ in range(2):  # miss, then hit; a fresh detector shares the cache
+            intent = CapabilityDetector().extract_intent("Parse JSON files into CSV")
+            self.assertNotIn("HACK", intent.entities)
+            self.assertNotIn("HACK", intent.keywords)
+            intent.entities.append("HACK")
+            intent.keywords.append("HACK")
+
+        request = "Convert PDF files to CSV"
+        available_tools = ["json-handler"]
+        compiled = CapabilityDetector.compile(available_tools)
+
+        for detect in (lambda: self.detector.detect_gap(request, available_tools),
+                       lambda: compiled.detect_gap(request)):
+            for _ in range(2):  # miss, then hit
+                result = detect()
+                core_functions = result["tool_requirements"]["core_functions"]
+                self.assertNotIn("HACK", core_functions)
+                core_functions.append("HACK")
+
     def test_complexity_estimation(self):
         """Test complexity estimation."""
         intent = Intent("data-transform", "convert", ["CSV", "JSON", "XML"], [])
@@ -288,17 +463,21 @@ class TestCapabilityDetector(unittest.TestCase):
 class TestToolGenerator(unittest.TestCase):
     """Test ToolGenerator functionality."""
     
-    def setUp(self):
-        """Set up test environment."""
-        self.test_dir = tempfile.mkdtemp()
-        self.skills_dir = Path(self.test_dir) / "skills"
-        self.skills_dir.mkdir()
-        
-        self.generator = ToolGenerator(str(self.skills_dir))
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared test environment."""
+        cls.test_dir = tempfile.mkdtemp(dir=TMP_ROOT)
+        cls.skills_dir = Path(cls.test_dir) / "skills"
+        cls.skills_dir.mkdir()
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test environment."""
-        shutil.rmtree(self.test_dir)
+        shutil.rmtree(cls.test_dir)
+    
+    def setUp(self):
+        """Set up generator."""
+        self.generator = ToolGenerator(str(self.skills_dir))
     
     def test_generate_skill_md(self):
         """Test SKILL.md generation."""
@@ -367,27 +546,15 @@ class TestToolGenerator(unittest.TestCase):
         
         # Verify files created
         tool_dir = self.skills_dir / tool_name
+        self.addCleanup(shutil.rmtree, tool_dir, ignore_errors=True)
         self.assertTrue(tool_dir.exists())
         self.assertTrue((tool_dir / "SKILL.md").exists())
         self.assertTrue((tool_dir / "metadata.json").exists())
         self.assertTrue((tool_dir / "tests.py").exists())
 
 
-class TestToolValidator(unittest.TestCase):
-    """Test ToolValidator functionality."""
-    
-    def setUp(self):
-        """Set up test environment."""
-        self.test_dir = tempfile.mkdtemp()
-        self.skills_dir = Path(self.test_dir) / "skills"
-        self.skills_dir.mkdir()
-        
-        # Create a valid test tool
-        self.tool_name = "valid-tool"
-        tool_dir = self.skills_dir / self.tool_name
-        tool_dir.mkdir()
-        
-        skill_md = """---
+# Rendered once per process; TestToolValidator writes these bytes as-is
+_VALID_SKILL_MD = """---
 name: valid-tool
 description: Valid test tool
 ---
@@ -440,22 +607,45 @@ if validate_input(data):
     print(result["data"])
 ```
 """
-        (tool_dir / "SKILL.md").write_text(skill_md)
+
+_VALID_METADATA = {
+    "skill_name": "valid-tool",
+    "created_by": "test",
+    "created_at": "2026-01-01T00:00:00",
+    "version": "1.0",
+    "status": "active"
+}
+
+_VALID_SKILL_MD_BYTES = _VALID_SKILL_MD.encode("utf-8")
+_VALID_METADATA_BYTES = json.dumps(_VALID_METADATA).encode("utf-8")
+
+
+class TestToolValidator(unittest.TestCase):
+    """Test ToolValidator functionality."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared, read-only test environment."""
+        cls.test_dir = tempfile.mkdtemp(dir=TMP_ROOT)
+        cls.skills_dir = Path(cls.test_dir) / "skills"
+        cls.skills_dir.mkdir()
         
-        metadata = {
-            "skill_name": "valid-tool",
-            "created_by": "test",
-            "created_at": "2026-01-01T00:00:00",
-            "version": "1.0",
-            "status": "active"
-        }
-        (tool_dir / "metadata.json").write_text(json.dumps(metadata))
+        # Create a valid test tool
+        cls.tool_name = "valid-tool"
+        tool_dir = cls.skills_dir / cls.tool_name
+        tool_dir.mkdir()
         
-        self.validator = ToolValidator(str(self.skills_dir))
+        (tool_dir / "SKILL.md").write_bytes(_VALID_SKILL_MD_BYTES)
+        (tool_dir / "metadata.json").write_bytes(_VALID_METADATA_BYTES)
     
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up test environment."""
-        shutil.rmtree(self.test_dir)
+        shutil.rmtree(cls.test_dir)
+    
+    def setUp(self):
+        """Set up validator."""
+        self.validator = ToolValidator(str(self.skills_dir))
     
     def test_validate_structure(self):
         """Test structure validation."""
@@ -484,7 +674,8 @@ if validate_input(data):
     def test_validate_syntax_valid(self):
         """Test syntax validation with valid Python."""
         py_file = self.skills_dir / "test.py"
-        py_file.write_text("def test():\n    pass\n")
+        py_file.write_bytes(b"def test():\n    pass\n")
+        self.addCleanup(py_file.unlink)
         
         result = self.validator.validate_syntax(py_file)
         self.assertTrue(result.passed)
@@ -492,7 +683,8 @@ if validate_input(data):
     def test_validate_syntax_invalid(self):
         """Test syntax validation with invalid Python."""
         py_file = self.skills_dir / "invalid.py"
-        py_file.write_text("def test(\n    pass\n")  # Missing closing paren
+        py_file.write_bytes(b"def test(\n    pass\n")  # Missing closing paren
+        self.addCleanup(py_file.unlink)
         
         result = self.validator.validate_syntax(py_file)
         self.assertFalse(result.passed)
@@ -512,7 +704,7 @@ class TestOrchestrator(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment."""
-        self.test_dir = tempfile.mkdtemp()
+        self.test_dir = tempfile.mkdtemp(dir=TMP_ROOT)
         self.skills_dir = Path(self.test_dir) / "skills"
         self.skills_dir.mkdir()
         self.log_file = Path(self.test_dir) / "test-log.json"
@@ -544,7 +736,67 @@ class TestOrchestrator(unittest.TestCase):
         tools = log.get_tools()
         self.assertEqual(len(tools), 1)
         self.assertEqual(tools[0]["name"], "test-tool")
-    
+
+    def test_creation_log_journal(self):
+        """Test journaled entries survive a reload and compaction."""
+        log = CreationLog(str(self.log_file))
+
+        for i in range(5):
+            log.add_entry({
+                "name": f"tool-{i}",
+                "capability_gap_type": "domain-gap",
+                "complexity_score": float(i),
+                "validation_passed": i % 2 == 0,
+                "hotreload_success": True
+            })
+
+        self.assertTrue(log.journal_file.exists())
+
+        reloaded = CreationLog(str(self.log_file))
+        self.assertEqual(reloaded.get_tools(), log.get_tools())
+        self.assertEqual(reloaded.get_stats(), log.get_stats())
+
+        reloaded.compact()
+        self.assertFalse(reloaded.journal_file.exists())
+
+        with open(self.log_file) as f:
+            self.assertEqual(len(json.load(f)["tools"]), 5)
+
+    def test_creation_log_torn_journal_line(self):
+        """Test entries after a torn journal line survive reloads."""
+        log = CreationLog(str(self.log_file))
+        for i in range(10):
+            log.add_entry({"name": f"tool-{i}"})
+        log.compact()
+        log.add_entry({"name": "a"})
+        with open(log.journal_file, "ab") as f:
+            f.write(b'{"id": "tool_012", "name": "lo')  # interrupted write
+
+        reopened = CreationLog(str(self.log_file))
+        new_ids = [reopened.add_entry({"name": name}) for name in ("b", "c")]
+
+        names = [tool["name"] for tool in CreationLog(str(self.log_file)).get_tools()]
+        self.assertEqual(names[-3:], ["a", "b", "c"])
+        # The torn entry's id may already have been handed out; never reuse it
+        self.assertEqual(new_ids, ["tool_013", "tool_014"])
+
+    def test_read_stats(self):
+        """Test stats-only reads agree with a full load."""
+        log = CreationLog(str(self.log_file))
+        for i in range(3):
+            log.add_entry({"name": f"tool-{i}", "capability_gap_type": "format-gap"})
+        log.compact()
+
+        self.assertEqual(CreationLog.read_stats(str(self.log_file)), log.get_stats())
+
+    def test_load_new_tool_missing(self):
+        """Test loading a missing tool times out and unsubscribes."""
+        callbacks = self.orchestrator.watcher.callbacks["tool_added"]
+        before = len(callbacks)
+
+        self.assertFalse(self.orchestrator._load_new_tool("no-such-tool", timeout=0.01))
+        self.assertEqual(len(callbacks), before)
+
     def test_export_state(self):
         """Test state export."""
         state = self.orchestrator.export_state()
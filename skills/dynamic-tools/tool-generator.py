@@ -10,7 +10,7 @@ import os
 import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 
 class DynamicToolGenerator:
@@ -45,6 +45,10 @@ class DynamicToolGenerator:
         # Create directory
         tool_path.mkdir(parents=True, exist_ok=True)
         
+        # One timestamp for every generated file, so SKILL.md, metadata.json
+        # and README.md agree on when the tool was generated
+        now = datetime.now()
+        
         result = {
             "tool_name": tool_name,
             "tool_path": str(tool_path),
@@ -53,41 +57,20 @@ class DynamicToolGenerator:
         }
         
         try:
-            # Generate SKILL.md
-            skill_md = self._generate_skill_md(gap_analysis, tool_name)
-            skill_md_path = tool_path / "SKILL.md"
-            
-            with open(skill_md_path, 'w') as f:
-                f.write(skill_md)
-            
-            result["files_created"].append(str(skill_md_path))
-            
-            # Generate metadata.json
-            metadata = self._generate_metadata(gap_analysis, tool_name)
-            metadata_path = tool_path / "metadata.json"
-            
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
-            result["files_created"].append(str(metadata_path))
-            
-            # Generate test template (if applicable)
-            tests_template = self._generate_test_template(tool_name)
-            tests_path = tool_path / "tests.py"
-            
-            with open(tests_path, 'w') as f:
-                f.write(tests_template)
-            
-            result["files_created"].append(str(tests_path))
-            
-            # Generate README.md
-            readme = self._generate_readme(gap_analysis, tool_name)
-            readme_path = tool_path / "README.md"
-            
-            with open(readme_path, 'w') as f:
-                f.write(readme)
+            # Render everything up front, then write each file in one shot
+            files = [
+                ("SKILL.md", self._generate_skill_md(gap_analysis, tool_name, now)),
+                ("metadata.json", json.dumps(
+                    self._generate_metadata(gap_analysis, tool_name, now), indent=2
+                )),
+                ("tests.py", self._generate_test_template(tool_name)),
+                ("README.md", self._generate_readme(gap_analysis, tool_name, now)),
+            ]
             
-            result["files_created"].append(str(readme_path))
+            for filename, content in files:
+                file_path = tool_path / filename
+                file_path.write_text(content, encoding="utf-8")
+                result["files_created"].append(str(file_path))
             
         except Exception as e:
             result["status"] = "error"
@@ -95,11 +78,14 @@ class DynamicToolGenerator:
         
         return result
     
-    def _generate_skill_md(self, gap_analysis: Dict, tool_name: str) -> str:
+    def _generate_skill_md(self, gap_analysis: Dict, tool_name: str,
+                           now: Optional[datetime] = None) -> str:
         """
         Generate comprehensive SKILL.md for the new tool.
         """
         
+        now = now or datetime.now()
+        generated_at = now.isoformat()
         intent = gap_analysis['intent']
         gap_type = gap_analysis['gap_type']
         complexity = gap_analysis['complexity_score']
@@ -115,7 +101,7 @@ class DynamicToolGenerator:
         skill_md = f"""---
 name: {tool_name}
 description: Auto-generated tool for {intent.replace('-', ' ')}
-generated_at: {datetime.now().isoformat()}
+generated_at: {generated_at}
 gap_type: {gap_type}
 complexity_score: {complexity:.1f}
 ---
@@ -128,7 +114,7 @@ This tool was automatically generated to address a capability gap in TARS.
 
 **Gap Type:** {gap_type.replace('-', ' ').title()}  
 **Complexity:** {complexity:.1f}/10  
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+**Generated:** {now.strftime('%Y-%m-%d %H:%M:%S')}
 
 ### Purpose
 
@@ -252,20 +238,23 @@ This tool may be enhanced with:
 ---
 
 *This skill was automatically generated by TARS's Dynamic Tool Creation System.*
-*Generated: {datetime.now().isoformat()}*
+*Generated: {generated_at}*
 """
         
         return skill_md
     
-    def _generate_metadata(self, gap_analysis: Dict, tool_name: str) -> Dict:
+    def _generate_metadata(self, gap_analysis: Dict, tool_name: str,
+                           now: Optional[datetime] = None) -> Dict:
         """
         Generate metadata.json for the new tool.
         """
         
+        generated_at = (now or datetime.now()).isoformat()
+        
         return {
             "skill_name": tool_name,
             "created_by": "dynamic-tool-generator",
-            "created_at": datetime.now().isoformat(),
+            "created_at": generated_at,
             "gap_analysis": {
                 "intent": gap_analysis['intent'],
                 "gap_type": gap_analysis['gap_type'],
@@ -286,7 +275,7 @@ This tool may be enhanced with:
             "status": "active",
             "version": "1.0",
             "hotreload_enabled": True,
-            "last_tested": datetime.now().isoformat(),
+            "last_tested": generated_at,
             "tags": [
                 gap_analysis['gap_type'],
                 gap_analysis['intent'],
@@ -379,11 +368,13 @@ if __name__ == '__main__':
         
         return test_code
     
-    def _generate_readme(self, gap_analysis: Dict, tool_name: str) -> str:
+    def _generate_readme(self, gap_analysis: Dict, tool_name: str,
+                         now: Optional[datetime] = None) -> str:
         """
         Generate README.md quickstart guide.
         """
         
+        now = now or datetime.now()
         intent = gap_analysis['intent']
         
         readme = f"""# {self._format_title(tool_name)}
@@ -466,7 +457,7 @@ python tests.py
 ---
 
 *Generated by TARS Dynamic Tool Creation System*  
-*{datetime.now().strftime('%Y-%m-%d')}*
+*{now.strftime('%Y-%m-%d')}*
 """
         
         return readme
@@ -8,6 +8,13 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 
+# Optional imports (graceful degradation)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 class ToolGenerator:
     """
@@ -406,29 +413,26 @@ if __name__ == '__main__':
         tool_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            # Generate SKILL.md
+            # Render every file before writing any, so a failure part-way
+            # leaves no half-written tool behind
             skill_md = self.generate_skill_md(tool_name, requirements, gap_info)
-            skill_md_path = tool_dir / "SKILL.md"
-            with open(skill_md_path, 'w', encoding='utf-8') as f:
-                f.write(skill_md)
             
-            # Generate metadata.json
             metadata = self.generate_metadata(tool_name, requirements, gap_info)
-            metadata_path = tool_dir / "metadata.json"
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=2)
+            if HAS_ORJSON:
+                metadata_bytes = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+            else:
+                metadata_bytes = json.dumps(metadata, indent=2).encode("utf-8")
             
-            # Generate tests.py
             tests = self.generate_tests(tool_name, requirements.get("core_functions", []))
-            tests_path = tool_dir / "tests.py"
-            with open(tests_path, 'w', encoding='utf-8') as f:
-                f.write(tests)
             
-            # Create README.md
             readme = f"# {self._format_title(tool_name)}\n\nSee SKILL.md for full documentation.\n"
-            readme_path = tool_dir / "README.md"
-            with open(readme_path, 'w', encoding='utf-8') as f:
-                f.write(readme)
+            
+            # SKILL.md goes last: discovery keys on it, so loaders and
+            # watchers never see the tool before its other files exist
+            _write_file(tool_dir / "metadata.json", metadata_bytes)
+            _write_file(tool_dir / "tests.py", tests.encode("utf-8"))
+            _write_file(tool_dir / "README.md", readme.encode("utf-8"))
+            _write_file(tool_dir / "SKILL.md", skill_md.encode("utf-8"))
             
             return True
             
@@ -437,6 +441,17 @@ if __name__ == '__main__':
             return False
 
 
+def _write_file(path: Path, data: bytes):
+    """Write bytes with a single unbuffered open/write/close."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 # Convenience function
 def create_tool_from_gap(gap_info: dict, skills_dir: str = "skills") -> bool:
     """
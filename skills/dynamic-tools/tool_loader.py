@@ -11,6 +11,13 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import time
 
+# Optional imports (graceful degradation)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 class ToolVersion:
     """Represents a versioned tool."""
@@ -59,41 +66,17 @@ class ToolLoader:
         if not self.skills_dir.exists():
             return discovered
         
-        for tool_dir in self.skills_dir.iterdir():
-            if not tool_dir.is_dir():
-                continue
-            
-            skill_md = tool_dir / "SKILL.md"
-            metadata_json = tool_dir / "metadata.json"
-            
-            if not skill_md.exists():
+        # scandir's cached d_type avoids a stat() per entry; is_dir() still
+        # follows symlinks, as Path.is_dir() did
+        with os.scandir(self.skills_dir) as entries:
+            tool_dirs = [Path(entry.path) for entry in entries if entry.is_dir()]
+        
+        for tool_dir in tool_dirs:
+            tool_info = self._tool_info(tool_dir)
+            if tool_info is None:
                 continue
             
-            tool_name = tool_dir.name
-            
-            # Parse metadata if exists
-            metadata = {}
-            if metadata_json.exists():
-                try:
-                    with open(metadata_json) as f:
-                        metadata = json.load(f)
-                except Exception as e:
-                    metadata = {"error": str(e)}
-            
-            # Extract version from metadata or default to 1.0
-            version = metadata.get("version", "1.0")
-            
-            tool_info = {
-                "name": tool_name,
-                "version": version,
-                "path": str(tool_dir),
-                "has_skill_md": True,
-                "has_metadata": metadata_json.exists(),
-                "has_implementation": (tool_dir / "implementation.py").exists(),
-                "has_tests": (tool_dir / "tests.py").exists(),
-                "metadata": metadata,
-                "discovered_at": datetime.now().isoformat()
-            }
+            tool_name = tool_info["name"]
             
             if tool_name not in discovered:
                 discovered[tool_name] = []
@@ -101,6 +84,65 @@ class ToolLoader:
         
         return discovered
     
+    def _tool_info(self, tool_dir: Path) -> Optional[dict]:
+        """Discovery info for one tool directory (None if it has no SKILL.md)."""
+        skill_md = tool_dir / "SKILL.md"
+        metadata_json = tool_dir / "metadata.json"
+        
+        if not skill_md.exists():
+            return None
+        
+        tool_name = tool_dir.name
+        
+        # Parse metadata if exists
+        metadata = {}
+        has_metadata = metadata_json.exists()
+        if has_metadata:
+            try:
+                if HAS_ORJSON:
+                    metadata = orjson.loads(metadata_json.read_bytes())
+                else:
+                    with open(metadata_json) as f:
+                        metadata = json.load(f)
+            except Exception as e:
+                metadata = {"error": str(e)}
+        
+        # Extract version from metadata or default to 1.0
+        version = metadata.get("version", "1.0")
+        
+        tool_info = {
+            "name": tool_name,
+            "version": version,
+            "path": str(tool_dir),
+            "has_skill_md": True,
+            "has_metadata": has_metadata,
+            "has_implementation": (tool_dir / "implementation.py").exists(),
+            "has_tests": (tool_dir / "tests.py").exists(),
+            "metadata": metadata,
+            "discovered_at": datetime.now().isoformat()
+        }
+        
+        return tool_info
+    
+    def _discover_tool(self, tool_name: str) -> List[dict]:
+        """
+        discover_tools().get(tool_name, []) without parsing every other
+        tool's metadata.json.
+        
+        The name is matched against the directory listing, as in
+        discover_tools, so path separators or case differences never
+        resolve to a directory a full scan wouldn't report.
+        """
+        if not self.skills_dir.exists() or tool_name not in os.listdir(self.skills_dir):
+            return []
+        
+        tool_dir = self.skills_dir / tool_name
+        if not tool_dir.is_dir():
+            return []
+        
+        tool_info = self._tool_info(tool_dir)
+        return [tool_info] if tool_info is not None else []
+    
     def load_tool(self, tool_name: str, version: Optional[str] = None) -> bool:
         """
         Load a tool into runtime.
@@ -112,14 +154,12 @@ class ToolLoader:
         Returns:
             True if loaded successfully, False otherwise
         """
-        discovered = self.discover_tools()
+        tool_versions = self._discover_tool(tool_name)
         
-        if tool_name not in discovered:
+        if not tool_versions:
             self._log_event("load_failed", tool_name, {"reason": "tool_not_found"})
             return False
         
-        tool_versions = discovered[tool_name]
-        
         # Select version
         if version:
             tool_info = next((t for t in tool_versions if t["version"] == version), None)
@@ -250,15 +290,19 @@ class ToolLoader:
     
     def list_available_tools(self) -> List[str]:
         """List all available tools (discovered in skills directory)."""
-        discovered = self.discover_tools()
-        return list(discovered.keys())
+        # Same names and order as discover_tools(), without parsing every
+        # tool's metadata.json just to throw it away
+        if not self.skills_dir.exists():
+            return []
+        
+        return [
+            entry.name for entry in os.scandir(self.skills_dir)
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, "SKILL.md"))
+        ]
     
     def get_tool_versions(self, tool_name: str) -> List[str]:
         """Get all available versions of a tool."""
-        discovered = self.discover_tools()
-        if tool_name not in discovered:
-            return []
-        return [t["version"] for t in discovered[tool_name]]
+        return [t["version"] for t in self._discover_tool(tool_name)]
     
     def load_with_fallback(self, tool_name: str, preferred_version: str = None) -> bool:
         """
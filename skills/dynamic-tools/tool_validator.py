@@ -2,10 +2,11 @@
 Tool Validator - Validate newly created tools before deployment
 """
 
+import functools
 import os
 import subprocess
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
 import json
 
 
@@ -49,6 +50,23 @@ class ToolValidator:
     def __init__(self, skills_dir: str = "skills"):
         self.skills_dir = Path(skills_dir)
     
+    @staticmethod
+    def _scan_dir(tool_path: Path) -> Set[str]:
+        """
+        Names of the existing entries in a tool directory.
+        
+        One scandir replaces a stat per exists() check; dangling symlinks
+        are left out, as exists() would report them missing.
+        """
+        try:
+            with os.scandir(tool_path) as entries:
+                return {
+                    entry.name for entry in entries
+                    if not entry.is_symlink() or os.path.exists(entry.path)
+                }
+        except OSError:
+            return set()
+    
     def validate_tool(self, tool_name: str) -> Dict[str, Any]:
         """
         Run complete validation pipeline.
@@ -75,27 +93,30 @@ class ToolValidator:
             "all_passed": True
         }
         
+        # List the directory once; every phase checks files against it
+        scan = self._scan_dir(tool_path)
+        
         # Phase 1: Structure validation
-        structure_result = self.validate_structure(tool_path)
+        structure_result = self.validate_structure(tool_path, scan)
         results["validations"]["structure"] = structure_result.to_dict()
         
         # Phase 2: Documentation validation
-        doc_result = self.validate_documentation(tool_path)
+        doc_result = self.validate_documentation(tool_path, scan)
         results["validations"]["documentation"] = doc_result.to_dict()
         
         # Phase 3: Metadata validation
-        metadata_result = self.validate_metadata(tool_path)
+        metadata_result = self.validate_metadata(tool_path, scan)
         results["validations"]["metadata"] = metadata_result.to_dict()
         
         # Phase 4: Syntax validation (if implementation exists)
         impl_path = tool_path / "implementation.py"
-        if impl_path.exists():
+        if "implementation.py" in scan:
             syntax_result = self.validate_syntax(impl_path)
             results["validations"]["syntax"] = syntax_result.to_dict()
         
         # Phase 5: Test execution (if tests exist)
         tests_path = tool_path / "tests.py"
-        if tests_path.exists():
+        if "tests.py" in scan:
             test_result = self.run_tests(tests_path)
             results["validations"]["tests"] = test_result.to_dict()
         
@@ -106,24 +127,28 @@ class ToolValidator:
         
         return results
     
-    def validate_structure(self, tool_path: Path) -> ValidationResult:
+    def validate_structure(self, tool_path: Path, scan: Optional[Set[str]] = None) -> ValidationResult:
         """
         Validate tool directory structure.
         
         Args:
             tool_path: Path to tool directory
+            scan: Entry names from _scan_dir (None = scan now)
         
         Returns:
             ValidationResult
         """
+        if scan is None:
+            scan = self._scan_dir(tool_path)
+        
         checks = {}
         
         # Check for required files
         skill_md = tool_path / "SKILL.md"
-        checks["has_skill_md"] = skill_md.exists()
+        checks["has_skill_md"] = "SKILL.md" in scan
         
         metadata_json = tool_path / "metadata.json"
-        checks["has_metadata"] = metadata_json.exists()
+        checks["has_metadata"] = "metadata.json" in scan
         
         # Check directory is readable
         checks["directory_readable"] = os.access(tool_path, os.R_OK)
@@ -143,19 +168,23 @@ class ToolValidator:
         
         return ValidationResult("structure", passed, checks)
     
-    def validate_documentation(self, tool_path: Path) -> ValidationResult:
+    def validate_documentation(self, tool_path: Path, scan: Optional[Set[str]] = None) -> ValidationResult:
         """
         Validate SKILL.md documentation.
         
         Args:
             tool_path: Path to tool directory
+            scan: Entry names from _scan_dir (None = scan now)
         
         Returns:
             ValidationResult
         """
+        if scan is None:
+            scan = self._scan_dir(tool_path)
+        
         skill_md = tool_path / "SKILL.md"
         
-        if not skill_md.exists():
+        if "SKILL.md" not in scan:
             return ValidationResult("documentation", False, {"error": "SKILL.md not found"})
         
         try:
@@ -180,19 +209,23 @@ class ToolValidator:
         
         return ValidationResult("documentation", passed, checks)
     
-    def validate_metadata(self, tool_path: Path) -> ValidationResult:
+    def validate_metadata(self, tool_path: Path, scan: Optional[Set[str]] = None) -> ValidationResult:
         """
         Validate metadata.json.
         
         Args:
             tool_path: Path to tool directory
+            scan: Entry names from _scan_dir (None = scan now)
         
         Returns:
             ValidationResult
         """
+        if scan is None:
+            scan = self._scan_dir(tool_path)
+        
         metadata_json = tool_path / "metadata.json"
         
-        if not metadata_json.exists():
+        if "metadata.json" not in scan:
             return ValidationResult("metadata", False, {"error": "metadata.json not found"})
         
         try:
@@ -231,23 +264,14 @@ class ToolValidator:
         Returns:
             ValidationResult
         """
+        # Unchanged files (same mtime and size) reuse the previous compile
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            
-            # Compile to check syntax
-            compile(code, str(file_path), 'exec')
-            
-            return ValidationResult("syntax", True, {"message": "Valid Python syntax"})
-            
-        except SyntaxError as e:
-            return ValidationResult("syntax", False, {
-                "error": "Syntax error",
-                "line": e.lineno,
-                "message": str(e)
-            })
+            st = os.stat(file_path)
         except Exception as e:
             return ValidationResult("syntax", False, {"error": str(e)})
+        
+        passed, details = _check_syntax(str(file_path), st.st_mtime_ns, st.st_size)
+        return ValidationResult("syntax", passed, dict(details))
     
     def run_tests(self, tests_path: Path, timeout: int = 30) -> ValidationResult:
         """
@@ -317,6 +341,28 @@ class ToolValidator:
         return results
 
 
+@functools.lru_cache(maxsize=1024)
+def _check_syntax(path: str, mtime_ns: int, size: int) -> tuple:
+    """Compile a file; (passed, details). The stat fields key the cache."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            code = f.read()
+        
+        # Compile to check syntax
+        compile(code, path, 'exec')
+        
+        return True, {"message": "Valid Python syntax"}
+        
+    except SyntaxError as e:
+        return False, {
+            "error": "Syntax error",
+            "line": e.lineno,
+            "message": str(e)
+        }
+    except Exception as e:
+        return False, {"error": str(e)}
+
+
 # Convenience function
 def validate_tool(tool_name: str, skills_dir: str = "skills") -> Dict[str, Any]:
     """
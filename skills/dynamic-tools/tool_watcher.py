@@ -4,11 +4,24 @@ Tool Watcher - Hot-reload system for tool definitions
 
 import os
 import time
+from collections import deque
 from pathlib import Path
-from typing import Callable, Dict, List, Set
+from typing import Callable, Dict, List, Optional, Set
 from datetime import datetime
 import hashlib
 
+# Optional imports (graceful degradation)
+try:
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+
+# Filesystem events that can change what check() reports; opened/closed
+# events (including our own hash reads) are ignored
+_WATCHED_EVENT_TYPES = frozenset({"created", "deleted", "modified", "moved"})
+
 
 class FileWatcher:
     """Watch files for changes."""
@@ -49,6 +62,21 @@ class FileWatcher:
         return False
 
 
+class _EventQueue:
+    """watchdog event handler that queues changed paths for ToolWatcher.check()."""
+    
+    def __init__(self):
+        self.paths = deque()
+    
+    def dispatch(self, event):
+        if event.event_type not in _WATCHED_EVENT_TYPES:
+            return
+        
+        self.paths.append(event.src_path)
+        if getattr(event, "dest_path", ""):
+            self.paths.append(event.dest_path)
+
+
 class ToolWatcher:
     """
     Watches skills directory for changes and triggers hot-reload.
@@ -59,9 +87,13 @@ class ToolWatcher:
     - Watch for tool deletions
     - Debounced reload (avoid rapid-fire reloads)
     - Event callbacks
+    
+    backend="watchdog" uses OS file events (inotify/FSEvents) when watchdog
+    is installed, so check() only re-stats tools that saw events and returns
+    immediately when nothing changed. Otherwise every check() polls.
     """
     
-    def __init__(self, skills_dir: str = "skills", debounce_ms: int = 500):
+    def __init__(self, skills_dir: str = "skills", debounce_ms: int = 500, backend: str = "poll"):
         self.skills_dir = Path(skills_dir)
         self.debounce_ms = debounce_ms
         self.watchers: Dict[str, Dict[str, FileWatcher]] = {}  # tool_name -> {file -> watcher}
@@ -75,8 +107,52 @@ class ToolWatcher:
         # Track known tools
         self.known_tools: Set[str] = set()
         
+        # Event backend state (None = polling)
+        self._observer = None
+        self._events: Optional[_EventQueue] = None
+        
         # Initialize
         self._scan_tools()
+        
+        if backend == "watchdog":
+            self._start_observer()
+    
+    def _start_observer(self):
+        """Start a recursive watchdog observer, falling back to polling."""
+        if not HAS_WATCHDOG or not self.skills_dir.is_dir():
+            return
+        
+        events = _EventQueue()
+        observer = Observer()
+        try:
+            observer.schedule(events, str(self.skills_dir), recursive=True)
+            observer.start()
+        except Exception as e:
+            print(f"[ToolWatcher] Falling back to polling: {e}")
+            return
+        
+        self._observer = observer
+        self._events = events
+    
+    def stop(self):
+        """Stop the event backend, if any; later checks poll."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+            self._events = None
+    
+    def _drain_events(self) -> Set[str]:
+        """Names of tools touched by queued filesystem events."""
+        paths = self._events.paths
+        root = str(self.skills_dir)
+        touched = set()
+        
+        while paths:
+            rel = os.path.relpath(os.fsdecode(paths.popleft()), root)
+            touched.add(rel.split(os.sep, 1)[0])
+        
+        return touched
     
     def _scan_tools(self):
         """Scan skills directory for tools."""
@@ -131,12 +207,23 @@ class ToolWatcher:
         Returns:
             List of change events
         """
+        # With an event backend, only tools that saw filesystem events are
+        # re-checked, and an empty queue means nothing changed
+        touched = None
+        if self._events is not None:
+            touched = self._drain_events()
+            if not touched:
+                return []
+        
         # Rescan directory to detect new/removed tools
         self._scan_tools()
         
         changes = []
         
         for tool_name, file_watchers in self.watchers.items():
+            if touched is not None and tool_name not in touched:
+                continue
+            
             for file_name, watcher in file_watchers.items():
                 if watcher.has_changed():
                     changes.append({
@@ -182,6 +269,17 @@ class ToolWatcher:
         if event in self.callbacks:
             self.callbacks[event].append(callback)
     
+    def off(self, event: str, callback: Callable):
+        """
+        Unregister a callback previously registered with on().
+        
+        Args:
+            event: Event name (tool_added, tool_updated, tool_removed)
+            callback: Function to remove
+        """
+        if callback in self.callbacks.get(event, ()):
+            self.callbacks[event].remove(callback)
+    
     def _trigger_event(self, event: str, tool_name: str, details: dict = None):
         """Trigger event callbacks."""
         if event in self.callbacks:
@@ -199,6 +297,7 @@ class ToolWatcher:
         """Export watcher state."""
         return {
             "skills_dir": str(self.skills_dir),
+            "backend": "poll" if self._events is None else "watchdog",
             "watched_tools": list(self.watchers.keys()),
             "total_watchers": sum(len(fw) for fw in self.watchers.values()),
             "last_scan": self.last_scan
@@ -0,0 +1,95 @@
+"""
+Unit tests for ConsensusEngine
+
+Run: python test_consensus_engine.py
+"""
+
+import json
+import unittest
+
+import numpy as np
+
+from consensus_engine import (
+    ConsensusEngine,
+    Decision,
+    Vote,
+    votes_from_dict,
+    votes_from_json_bulk,
+)
+
+VOTES_DATA = [
+    {"agent_id": "a", "decision": "YES", "confidence": 0.9, "reasoning": "fast"},
+    {"agent_id": "b", "decision": "no", "confidence": 0.6, "reasoning": "costly"},
+    {"agent_id": "c", "decision": "ABSTAIN", "confidence": 0.0},
+    {"agent_id": "d", "decision": "YES", "confidence": 0.7, "reasoning": "naïve ✓"},
+]
+
+
+class TestCollectPairwise(unittest.TestCase):
+    """collect_pairwise picks the candidate agreeing most with the others."""
+
+    def setUp(self):
+        self.engine = ConsensusEngine()
+
+    def test_best_index_and_scores(self):
+        utilities = [
+            [9.0, 0.2, 0.4],
+            [0.6, 9.0, 0.8],
+            [0.1, 0.3, 9.0],
+        ]
+        result = self.engine.collect_pairwise(utilities)
+
+        self.assertEqual(result.best_index, 1)  # diagonal is ignored
+        np.testing.assert_allclose(result.scores, [0.3, 0.7, 0.2])
+        self.assertEqual(result.to_dict(), {"best_index": 1, "scores": [0.3, 0.7, 0.2]})
+
+    def test_ties_go_to_lowest_index(self):
+        result = self.engine.collect_pairwise(np.ones((3, 3)))
+        self.assertEqual(result.best_index, 0)
+
+    def test_rejects_bad_shapes(self):
+        with self.assertRaises(ValueError):
+            self.engine.collect_pairwise(np.ones((2, 3)))
+        with self.assertRaises(ValueError):
+            self.engine.collect_pairwise(np.ones((1, 1)))
+
+
+class TestSerialization(unittest.TestCase):
+    """to_json and votes_from_json_bulk round-trip the dict-based paths."""
+
+    def setUp(self):
+        self.engine = ConsensusEngine(confidence_calibration=0.9)
+        self.votes = votes_from_dict(VOTES_DATA)
+
+    def test_to_json_matches_to_dict(self):
+        result = self.engine.collect_votes(self.votes)
+        self.assertEqual(json.loads(result.to_json()), result.to_dict())
+
+    def test_votes_from_json_bulk_columns(self):
+        raw = json.dumps(VOTES_DATA, ensure_ascii=False)
+        for payload in (raw, raw.encode("utf-8")):
+            agent_ids, decisions, confidences = votes_from_json_bulk(payload)
+            self.assertEqual(list(agent_ids), ["a", "b", "c", "d"])
+            self.assertEqual(decisions.tolist(), [1, -1, 0, 1])
+            np.testing.assert_allclose(confidences, [0.9, 0.6, 0.0, 0.7])
+
+    def test_collect_arrays_matches_collect_votes(self):
+        _, decisions, confidences = votes_from_json_bulk(json.dumps(VOTES_DATA))
+        from_arrays = self.engine.collect_arrays(decisions, confidences)
+        from_votes = self.engine.collect_votes(self.votes)
+
+        self.assertEqual(from_arrays.final_decision, from_votes.final_decision)
+        self.assertAlmostEqual(from_arrays.weighted_score, from_votes.weighted_score)
+        self.assertEqual(from_arrays.vote_breakdown, from_votes.vote_breakdown)
+        self.assertEqual(from_arrays.individual_votes, [])
+
+    def test_votes_from_dict(self):
+        self.assertEqual(
+            [v.decision for v in self.votes],
+            [Decision.YES, Decision.NO, Decision.ABSTAIN, Decision.YES],
+        )
+        self.assertIsInstance(self.votes[0], Vote)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,340 @@
+"""
+Unit tests for MultiAgentOrchestrator
+
+Run: python test_multi_agent_orchestrator.py
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from consensus_engine import Decision
+from multi_agent_orchestrator import (
+    MultiAgentOrchestrator,
+    AgentVoteResponse,
+    build_voting_workflow,
+    make_budget_decision_question,
+    make_tool_selection_question,
+)
+
+
+def make_collector(delays=None, decision="YES", release=None):
+    """Sync collector voting `decision`; agents in `delays` sleep (or block on `release`) first"""
+    delays = delays or {}
+
+    def collector(agent_id, prompt):
+        if agent_id in delays:
+            if release is not None:
+                release.wait(delays[agent_id])
+            else:
+                time.sleep(delays[agent_id])
+        return AgentVoteResponse(agent_id, decision, 0.9, "test vote")
+
+    return collector
+
+
+class TestSyncCollectors(unittest.TestCase):
+    """Sync wrappers must not wait for abandoned collector threads."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.question = make_tool_selection_question(["REST", "GraphQL"], "CRUD service")
+
+    def test_timeout_does_not_wait_for_hung_collector(self):
+        """A hung agent abstains after timeout_seconds; run_consensus returns"""
+        orchestrator = MultiAgentOrchestrator(
+            agents=["a", "b", "c"],
+            vote_collector=make_collector({"c": 30}, release=self.release),
+        )
+
+        start = time.perf_counter()
+        result = orchestrator.run_consensus(self.question, timeout_seconds=0.2)
+
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(result.final_decision, Decision.YES)
+        abstained = [v.agent_id for v in result.individual_votes if v.decision == Decision.ABSTAIN]
+        self.assertEqual(abstained, ["c"])
+
+    def test_early_stop_does_not_wait_for_straggler(self):
+        """Once the outcome is settled, the sync wrapper returns without the straggler"""
+        orchestrator = MultiAgentOrchestrator(
+            agents=["a", "b", "c"],
+            vote_collector=make_collector({"c": 30}, release=self.release),
+            early_stop=True,
+        )
+
+        start = time.perf_counter()
+        result = orchestrator.run_consensus(self.question)
+        results = build_voting_workflow(orchestrator, [self.question])
+
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(result.final_decision, Decision.YES)
+        self.assertEqual(results[0].final_decision, Decision.YES)
+
+    def test_batched_timeout_does_not_wait_for_hung_agent(self):
+        """run_batched abstains for a hung batch_collector instead of blocking"""
+        def batch_collector(agent_id, prompt):
+            if agent_id == "c":
+                self.release.wait(30)
+            return '[{"qid": "%s", "decision": "YES", "confidence": 0.9}]' % (
+                self.question.question_id
+            )
+
+        orchestrator = MultiAgentOrchestrator(
+            agents=["a", "b", "c"], batch_collector=batch_collector
+        )
+
+        start = time.perf_counter()
+        [result] = orchestrator.run_batched([self.question], timeout_seconds=0.2)
+
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(result.vote_breakdown["ABSTAIN"], 1)
+
+
+class TestVotingWorkflow(unittest.TestCase):
+    """build_voting_workflow fans questions out and keeps their order."""
+
+    def test_results_follow_decision_points(self):
+        def collector(agent_id, prompt):
+            decision = "YES" if "approve" in prompt else "NO"
+            return AgentVoteResponse(agent_id, decision, 0.8, "test vote")
+
+        orchestrator = MultiAgentOrchestrator(agents=["a", "b"], vote_collector=collector)
+        questions = [
+            make_tool_selection_question([tool, "other"], task)
+            for tool, task in [("x", "approve"), ("y", "reject"), ("z", "approve")]
+        ]
+
+        results = build_voting_workflow(orchestrator, questions, max_concurrency=2)
+
+        self.assertEqual(
+            [r.final_decision for r in results],
+            [Decision.YES, Decision.NO, Decision.YES],
+        )
+
+
+class TestResultCache(unittest.TestCase):
+    """cache_ttl_seconds reuses results only for the same question."""
+
+    def setUp(self):
+        self.calls = []
+
+        def collector(agent_id, prompt):
+            self.calls.append(prompt)
+            decision = "YES" if "task one" in prompt else "NO"
+            return AgentVoteResponse(agent_id, decision, 0.9, "test vote")
+
+        self.orchestrator = MultiAgentOrchestrator(
+            agents=["a", "b"], vote_collector=collector, cache_ttl_seconds=60
+        )
+
+    def test_repeat_question_hits_cache(self):
+        question = make_tool_selection_question(["X", "Y"], "task one")
+
+        first = self.orchestrator.run_consensus(question)
+        second = self.orchestrator.run_consensus(question)
+
+        self.assertIs(second, first)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_same_candidates_different_prompt_miss_cache(self):
+        """Regression: question ids ignore the task, so the prompt must be in the key"""
+        one = make_tool_selection_question(["X", "Y"], "task one")
+        two = make_tool_selection_question(["X", "Y"], "task two")
+        self.assertEqual(one.question_id, two.question_id)
+
+        self.assertEqual(self.orchestrator.run_consensus(one).final_decision, Decision.YES)
+        self.assertEqual(self.orchestrator.run_consensus(two).final_decision, Decision.NO)
+        self.assertEqual(len(self.calls), 4)
+
+    def test_cache_is_bounded(self):
+        self.orchestrator.cache_max_entries = 3
+        for i in range(10):
+            self.orchestrator.run_consensus(
+                make_tool_selection_question([f"tool{i}", "Y"], "task one")
+            )
+
+        self.assertEqual(len(self.orchestrator._result_cache), 3)
+
+    def test_expired_entries_are_evicted_on_store(self):
+        clock = [1000.0]
+        with mock.patch("multi_agent_orchestrator.time.monotonic", lambda: clock[0]):
+            self.orchestrator.run_consensus(make_tool_selection_question(["X", "Y"], "task one"))
+            clock[0] += 61
+            self.orchestrator.run_consensus(make_tool_selection_question(["Z", "Y"], "task one"))
+
+        self.assertEqual(len(self.orchestrator._result_cache), 1)
+
+
+class TestBatched(unittest.TestCase):
+    """run_batched asks each agent once and falls back per question."""
+
+    def setUp(self):
+        self.questions = [
+            make_tool_selection_question(["REST", "GraphQL"], "CRUD service"),
+            make_budget_decision_question({"spot": "cheap", "reserved": "safe"}, "$1k"),
+        ]
+        self.qids = [q.question_id for q in self.questions]
+        self.batch_calls = []
+        self.single_calls = []
+
+    def batch_collector(self, reply):
+        def collector(agent_id, prompt):
+            self.batch_calls.append(agent_id)
+            return reply
+        return collector
+
+    def single_collector(self, agent_id, prompt):
+        self.single_calls.append((agent_id, prompt))
+        return AgentVoteResponse(agent_id, "NO", 0.5, "fallback")
+
+    def test_one_call_per_agent(self):
+        reply = json.dumps([
+            {"qid": self.qids[0], "decision": "YES", "confidence": 0.9},
+            {"qid": self.qids[1], "decision": "NO", "confidence": 0.8},
+        ])
+        orchestrator = MultiAgentOrchestrator(
+            agents=["a", "b", "c"],
+            vote_collector=self.single_collector,
+            batch_collector=self.batch_collector(reply),
+        )
+
+        results = orchestrator.run_batched(self.questions)
+
+        self.assertEqual(sorted(self.batch_calls), ["a", "b", "c"])
+        self.assertEqual(self.single_calls, [])
+        self.assertEqual(
+            [r.final_decision for r in results], [Decision.YES, Decision.NO]
+        )
+        self.assertEqual(len(orchestrator.get_history()), 2)
+
+    def test_unanswered_questions_fall_back_to_vote_collector(self):
+        reply = json.dumps([{"qid": self.qids[0], "decision": "YES", "confidence": 0.9}])
+        orchestrator = MultiAgentOrchestrator(
+            agents=["a", "b"],
+            vote_collector=self.single_collector,
+            batch_collector=self.batch_collector(reply),
+        )
+
+        results = orchestrator.run_batched(self.questions)
+
+        self.assertEqual(results[0].final_decision, Decision.YES)
+        self.assertEqual(results[1].final_decision, Decision.NO)
+        self.assertEqual(
+            sorted(agent for agent, _ in self.single_calls), ["a", "b"]
+        )
+        self.assertTrue(all(p == self.questions[1].prompt for _, p in self.single_calls))
+
+    def test_invalid_reply_without_vote_collector_abstains(self):
+        orchestrator = MultiAgentOrchestrator(
+            agents=["a", "b"], batch_collector=self.batch_collector("not json")
+        )
+
+        results = orchestrator.run_batched(self.questions)
+
+        for result in results:
+            self.assertEqual(result.vote_breakdown["ABSTAIN"], 2)
+
+    def test_shared_question_id_different_tasks(self):
+        """Questions sharing an id but not a task get separate votes and results"""
+        prompts = []
+
+        def batch_collector(agent_id, prompt):
+            prompts.append(prompt)
+            return json.dumps([
+                {"qid": qid, "decision": "YES" if task == "task one" else "NO",
+                 "confidence": 0.9}
+                for qid, task in re.findall(r"\[qid: ([^\]]+)\]\nTask: (.*)", prompt)
+            ])
+
+        one = make_tool_selection_question(["X", "Y"], "task one")
+        two = make_tool_selection_question(["X", "Y"], "task two")
+        self.assertEqual(one.question_id, two.question_id)
+        orchestrator = MultiAgentOrchestrator(agents=["a", "b"], batch_collector=batch_collector)
+
+        results = orchestrator.run_batched([one, two, one])
+
+        self.assertEqual(
+            [r.final_decision for r in results], [Decision.YES, Decision.NO, Decision.YES]
+        )
+        self.assertIs(results[2], results[0])  # exact repeat asked once
+        self.assertEqual(prompts[0].count("[qid: "), 2)
+        self.assertEqual(len(orchestrator.get_history()), 2)
+
+    def test_parse_batch_reply_drops_malformed_entries(self):
+        orchestrator = MultiAgentOrchestrator(agents=["a"])
+        reply = json.dumps([
+            {"qid": self.qids[0], "decision": "YES", "confidence": 0.9, "reasoning": "ok"},
+            {"qid": self.qids[0], "decision": "NO", "confidence": 0.1},  # duplicate
+            {"qid": self.qids[1], "decision": "NO"},  # no confidence
+            {"qid": "unknown", "decision": "YES", "confidence": 1.0},
+            "not an object",
+        ])
+
+        answers = orchestrator._parse_batch_reply("a", reply, self.qids)
+
+        self.assertEqual(
+            answers, {self.qids[0]: AgentVoteResponse("a", "YES", 0.9, "ok")}
+        )
+        self.assertEqual(
+            orchestrator._parse_batch_reply("a", '{"qid": 1}', self.qids), {}
+        )
+
+
+class TestHistoryJournal(unittest.TestCase):
+    """history_path appends one JSON line per decision."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        self.history_path = os.path.join(self.test_dir, "history.jsonl")
+
+    def decide(self, orchestrator, task):
+        question = make_tool_selection_question(["X", "Y"], task)
+        votes = [
+            AgentVoteResponse("a", "YES", 0.9, "a"),
+            AgentVoteResponse("b", "NO", 0.4, "b"),
+        ]
+        return orchestrator.inject_votes(question, votes)
+
+    def test_each_decision_is_appended(self):
+        first = MultiAgentOrchestrator(agents=["a", "b"], history_path=self.history_path)
+        self.decide(first, "task one")
+        self.decide(first, "task two")
+        # A new orchestrator keeps appending to the same journal
+        self.decide(
+            MultiAgentOrchestrator(agents=["a", "b"], history_path=self.history_path),
+            "task three",
+        )
+
+        with open(self.history_path, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+
+        self.assertEqual(
+            [e["prompt"].splitlines()[0] for e in entries],
+            ["Task: task one", "Task: task two", "Task: task three"],
+        )
+        self.assertEqual(entries[:2], [dict(e) for e in first.get_history()])
+
+    def test_export_history_json(self):
+        orchestrator = MultiAgentOrchestrator(agents=["a", "b"])
+        result = self.decide(orchestrator, "task one")
+        export_path = os.path.join(self.test_dir, "export.json")
+
+        orchestrator.export_history_json(export_path)
+
+        with open(export_path, encoding="utf-8") as f:
+            exported = json.load(f)
+        self.assertEqual(len(exported), 1)
+        self.assertEqual(exported[0]["result"], result.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()